@@ -1,22 +1,14 @@
 import pandas as pd
 import plotly.express as px
-import plotly.graph_objects as go
 from plotly.subplots import make_subplots
 
-def create_usa_heatmap():
-    df = pd.read_csv("processed_roadside_attractions.csv")
-    
-    state_counts = df['state'].value_counts()
-    
-    state_data = []
-    for state_abbr, count in state_counts.items():
-        state_data.append({
-            'state': state_abbr,
-            'attractions': count,
-            'density': count
-        })
-    
-    state_df = pd.DataFrame(state_data)
+def create_usa_heatmap(df):
+    state_df = (
+        df['state'].value_counts()
+        .rename_axis('state')
+        .reset_index(name='attractions')
+        .assign(density=lambda d: d['attractions'])
+    )
     
     print(f"Creating heatmap for {len(state_df)} states...")
     print(f"Attraction range: {state_df['attractions'].min()} - {state_df['attractions'].max()}")
@@ -60,7 +52,7 @@ def create_usa_heatmap():
                      "<extra></extra>"
     )
     
-    fig.write_html("usa_attractions_heatmap.html")
+    fig.write_html("usa_attractions_heatmap.html", include_plotlyjs="cdn")
     print("Heatmap saved as: usa_attractions_heatmap.html")
     
     print("\n" + "="*50)
@@ -86,9 +78,7 @@ def create_usa_heatmap():
     
     return fig
 
-def create_detailed_analysis():
-    df = pd.read_csv("processed_roadside_attractions.csv")
-    
+def create_detailed_analysis(df):
     category_counts = df['category'].value_counts()
     
     fig = make_subplots(
@@ -97,24 +87,27 @@ def create_detailed_analysis():
         specs=[[{"type": "pie"}, {"type": "bar"}]]
     )
     
-    fig.add_trace(
-        go.Pie(
-            labels=category_counts.index,
-            values=category_counts.values,
-            name="Categories"
-        ),
-        row=1, col=1
-    )
-    
     top_states = df['state'].value_counts().head(15)
-    fig.add_trace(
-        go.Bar(
-            x=top_states.index,
-            y=top_states.values,
-            name="States",
-            marker_color='red'
-        ),
-        row=1, col=2
+    
+    # Plain dict traces skip graph_objects' per-attribute validation on construction,
+    # and one add_traces call places both subplots in a single figure update
+    fig.add_traces(
+        [
+            dict(
+                type='pie',
+                labels=category_counts.index,
+                values=category_counts.values,
+                name="Categories"
+            ),
+            dict(
+                type='bar',
+                x=top_states.index,
+                y=top_states.values,
+                name="States",
+                marker=dict(color='red')
+            )
+        ],
+        rows=[1, 1], cols=[1, 2]
     )
     
     fig.update_layout(
@@ -125,14 +118,15 @@ def create_detailed_analysis():
         height=500
     )
     
-    fig.write_html("attractions_analysis.html")
+    fig.write_html("attractions_analysis.html", include_plotlyjs="cdn")
     print("Analysis saved as: attractions_analysis.html")
 
 def main():
     print("Creating USA Attractions Heatmap...")
     
-    heatmap_fig = create_usa_heatmap()
-    create_detailed_analysis()
+    df = pd.read_csv("processed_roadside_attractions.csv", usecols=['state', 'category'], dtype='category')
+    heatmap_fig = create_usa_heatmap(df)
+    create_detailed_analysis(df)
     
     print("\n✅ Complete! You now have:")
     print("  • usa_attractions_heatmap.html - Single USA heatmap")
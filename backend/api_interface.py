@@ -1,16 +1,30 @@
 #!/usr/bin/env python3
 
 import logging
+import random
 import numpy as np
 from typing import List, Dict, Any, Optional
 import time
 import json
 import pandas as pd
 import os
+from functools import lru_cache
 
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+EARTH_RADIUS_MILES = 3958.8
+
+# Keyed on the raw coordinate bytes so repeated optimizations of the same stops reuse one matrix;
+# kept small because each entry is n x n
+@lru_cache(maxsize=8)
+def _distance_matrix(coords_key: bytes) -> np.ndarray:
+    coordinates = np.frombuffer(coords_key).reshape(-1, 2)
+    deltas = coordinates[:, None, :] - coordinates[None, :, :]
+    matrix = np.sqrt((deltas ** 2).sum(axis=-1))
+    matrix.flags.writeable = False
+    return matrix
+
 class RouteOptimizationAPI:
     
     def __init__(self, data_file: str = "analysis/california_attractions_data.csv"):
@@ -18,6 +32,9 @@ class RouteOptimizationAPI:
         self.attractions = []
         self.coordinates = None
         self.attraction_names = []
+        # Per-instance so cached routes go away with the API object
+        self._route_cache: Dict[tuple, Dict[str, Any]] = {}
+        self._route_cache_size = 1024
         
         self._initialize_system()
     
@@ -26,13 +43,19 @@ class RouteOptimizationAPI:
             self.attractions = self._load_california_attractions()
             self.attraction_names = [attraction['name'] for attraction in self.attractions]
             self.coordinates = np.array([[attraction['latitude'], attraction['longitude']] for attraction in self.attractions])
+            self._build_spatial_index()
             
-            logger.info(f"API initialized with {len(self.attractions)} attractions")
+            logger.info("API initialized with %s attractions", len(self.attractions))
             
         except Exception as e:
-            logger.error(f"Error initializing API: {e}")
+            logger.error("Error initializing API: %s", e)
             raise
     
+    def _build_spatial_index(self):
+        from sklearn.neighbors import BallTree
+        
+        self.attraction_tree = BallTree(np.radians(self.coordinates), metric="haversine")
+    
     def get_all_locations(self) -> List[Dict[str, Any]]:
         return self.attractions
     
@@ -53,15 +76,33 @@ class RouteOptimizationAPI:
             self.attractions.append(new_attraction)
             self.attraction_names.append(name)
             self.coordinates = np.array([[attraction['latitude'], attraction['longitude']] for attraction in self.attractions])
+            self._build_spatial_index()
             
-            logger.info(f"Added custom location: {name} (ID: {new_id})")
+            logger.info("Added custom location: %s (ID: %s)", name, new_id)
             return new_id
             
         except Exception as e:
-            logger.error(f"Error adding custom location: {e}")
+            logger.error("Error adding custom location: %s", e)
             raise
     
     def optimize_route(self, location_ids: List[int]) -> Dict[str, Any]:
+        # Ids are append-only, so a given ordered id tuple always maps to the same stops
+        key = tuple(location_ids)
+        route = self._route_cache.get(key)
+        if route is None:
+            route = self._optimize_location_ids(key)
+            if len(self._route_cache) >= self._route_cache_size:
+                self._route_cache.pop(next(iter(self._route_cache)), None)
+            self._route_cache[key] = route
+        return {
+            'optimized_route': {
+                **route,
+                'location_ids': list(route['location_ids']),
+                'location_names': list(route['location_names'])
+            }
+        }
+    
+    def _optimize_location_ids(self, location_ids: tuple) -> Dict[str, Any]:
         try:
             if len(location_ids) < 2:
                 raise ValueError("Need at least 2 locations to optimize")
@@ -80,16 +121,29 @@ class RouteOptimizationAPI:
             
             selected_coords = np.array(selected_coords)
             
-            optimized_route = self._simple_optimize_route(selected_coords)
+            result = self.optimize_coordinates(selected_coords)
+            optimized_route = result['optimized_route']['location_ids']
+            
+            result['optimized_route']['location_names'] = [selected_names[i] for i in optimized_route]
+            result['optimized_route']['location_ids'] = [location_ids[i] for i in optimized_route]
+            
+            return result['optimized_route']
+            
+        except Exception as e:
+            logger.error("Error optimizing route: %s", e)
+            raise
+    
+    def optimize_coordinates(self, coordinates: np.ndarray) -> Dict[str, Any]:
+        try:
+            if len(coordinates) < 2:
+                raise ValueError("Need at least 2 locations to optimize")
             
-            total_distance = self._calculate_route_distance(selected_coords, optimized_route)
-            optimized_names = [selected_names[i] for i in optimized_route]
-            optimized_ids = [location_ids[i] for i in optimized_route]
+            optimized_route = self._simple_optimize_route(coordinates)
+            total_distance = self._calculate_route_distance(coordinates, optimized_route)
             
             result = {
                 'optimized_route': {
-                    'location_ids': optimized_ids,
-                    'location_names': optimized_names,
+                    'location_ids': optimized_route,
                     'total_distance': total_distance,
                     'execution_time': 0.1
                 }
@@ -98,33 +152,35 @@ class RouteOptimizationAPI:
             return result
             
         except Exception as e:
-            logger.error(f"Error optimizing route: {e}")
+            logger.error("Error optimizing coordinates: %s", e)
             raise
     
+    def _get_distance_matrix(self, coordinates: np.ndarray) -> np.ndarray:
+        return _distance_matrix(np.ascontiguousarray(coordinates, dtype=np.float64).tobytes())
+    
     def _simple_optimize_route(self, coordinates: np.ndarray) -> List[int]:
         n = len(coordinates)
         if n <= 1:
             return list(range(n))
         
+        distances = self._get_distance_matrix(coordinates)
         route = [0]
         unvisited = set(range(1, n))
         
         while unvisited:
-            current = route[-1]
-            nearest = min(unvisited, key=lambda x: np.linalg.norm(coordinates[current] - coordinates[x]))
+            current = distances[route[-1]]
+            nearest = min(unvisited, key=current.__getitem__)
             route.append(nearest)
             unvisited.remove(nearest)
         
         return route
     
     def _calculate_route_distance(self, coordinates: np.ndarray, route: List[int]) -> float:
-        total_distance = 0.0
-        for i in range(len(route) - 1):
-            point1 = coordinates[route[i]]
-            point2 = coordinates[route[i + 1]]
-            distance = np.linalg.norm(point1 - point2)
-            total_distance += distance
-        return total_distance
+        if len(route) < 2:
+            return 0.0
+        # Only consecutive legs are needed, so skip the n x n matrix
+        legs = np.diff(np.asarray(coordinates, dtype=np.float64)[np.asarray(route)], axis=0)
+        return float(np.linalg.norm(legs, axis=1).sum())
     
     def compare_with_random(self, location_ids: List[int]) -> Dict[str, Any]:
         try:
@@ -141,7 +197,6 @@ class RouteOptimizationAPI:
             
             selected_coords = np.array(selected_coords)
             
-            import random
             random_route = list(range(len(selected_coords)))
             random.shuffle(random_route)
             random_distance = self._calculate_route_distance(selected_coords, random_route)
@@ -164,20 +219,20 @@ class RouteOptimizationAPI:
             return comparison
             
         except Exception as e:
-            logger.error(f"Error comparing routes: {e}")
+            logger.error("Error comparing routes: %s", e)
             raise
     
+    def _gather_route(self, route_ids: List[int]) -> tuple:
+        # Attraction ids are their positions in self.attractions, so the whole route is one gather
+        ids = np.asarray(route_ids, dtype=np.intp)
+        if ids.size and (ids.min() < 0 or ids.max() >= len(self.attractions)):
+            raise ValueError(f"Invalid location ID in route: {route_ids}")
+        return self.coordinates[ids], [self.attraction_names[i] for i in ids]
+
     def get_route_visualization_data(self, route_ids: List[int]) -> Dict[str, Any]:
         try:
-            route_coordinates = []
-            route_names = []
-            
-            for loc_id in route_ids:
-                attraction = next(attraction for attraction in self.attractions if attraction['id'] == loc_id)
-                route_coordinates.append([attraction['latitude'], attraction['longitude']])
-                route_names.append(attraction['name'])
-            
-            coords_array = np.array(route_coordinates)
+            coords_array, route_names = self._gather_route(route_ids)
+            route_coordinates = coords_array.tolist()
             total_distance = self._calculate_route_distance(coords_array, list(range(len(route_coordinates))))
             
             visualization_data = {
@@ -190,35 +245,31 @@ class RouteOptimizationAPI:
             return visualization_data
             
         except Exception as e:
-            logger.error(f"Error getting visualization data: {e}")
+            logger.error("Error getting visualization data: %s", e)
             raise
 
     def get_street_routing_data(self, route_ids: List[int]) -> Dict[str, Any]:
         try:
-            route_coordinates = []
-            route_names = []
-            
-            for loc_id in route_ids:
-                attraction = next(attraction for attraction in self.attractions if attraction['id'] == loc_id)
-                route_coordinates.append([attraction['latitude'], attraction['longitude']])
-                route_names.append(attraction['name'])
-            
-            coords_array = np.array(route_coordinates)
-            total_distance = self._calculate_route_distance(coords_array, list(range(len(route_coordinates))))
-            
-            routing_data = {
-                'route_coordinates': route_coordinates,
-                'route_names': route_names,
-                'total_distance': total_distance,
-                'num_locations': len(route_ids)
-            }
-            
-            return routing_data
+            coords_array, route_names = self._gather_route(route_ids)
+            return self.get_coordinate_routing_data(coords_array, route_names)
             
         except Exception as e:
-            logger.error(f"Error getting street routing data: {e}")
+            logger.error("Error getting street routing data: %s", e)
             raise
 
+    def get_coordinate_routing_data(self, coordinates: np.ndarray, route_names: List[str]) -> Dict[str, Any]:
+        # Routing data for stops given directly as ordered (lat, lng) rows rather than catalog ids
+        coords_array = np.asarray(coordinates, dtype=np.float64)
+        route_coordinates = coords_array.tolist()
+        total_distance = self._calculate_route_distance(coords_array, list(range(len(route_coordinates))))
+        
+        return {
+            'route_coordinates': route_coordinates,
+            'route_names': list(route_names),
+            'total_distance': total_distance,
+            'num_locations': len(route_coordinates)
+        }
+
     def get_street_directions(self, optimized_route: List[Dict[str, Any]]) -> Dict[str, Any]:
         try:
             if len(optimized_route) < 2:
@@ -251,7 +302,7 @@ class RouteOptimizationAPI:
             return directions_data
             
         except Exception as e:
-            logger.error(f"Error getting street directions: {e}")
+            logger.error("Error getting street directions: %s", e)
             raise
 
     def get_attractions_along_route(self, from_city: str, to_city: str, max_attractions: int = 9, max_distance_miles: float = 25.0) -> List[Dict[str, Any]]:
@@ -270,15 +321,15 @@ class RouteOptimizationAPI:
             start_coords = (start_location.latitude, start_location.longitude)
             end_coords = (end_location.latitude, end_location.longitude)
             
-            logger.info(f"Route from {from_city} ({start_coords}) to {to_city} ({end_coords})")
+            logger.info("Route from %s (%s) to %s (%s)", from_city, start_coords, to_city, end_coords)
             
             route_points = self._get_route_points(start_coords, end_coords)
             
             nearby_attractions = self._find_attractions_near_route(
-                self.attractions, route_points, max_distance_miles, max_attractions
+                route_points, max_distance_miles, max_attractions
             )
             
-            logger.info(f"Found {len(nearby_attractions)} attractions near route")
+            logger.info("Found %s attractions near route", len(nearby_attractions))
             
             formatted_attractions = []
             for i, attraction in enumerate(nearby_attractions):
@@ -297,11 +348,11 @@ class RouteOptimizationAPI:
                 }
                 formatted_attractions.append(formatted_attraction)
             
-            logger.info(f"Formatted {len(formatted_attractions)} attractions for frontend")
+            logger.info("Formatted %s attractions for frontend", len(formatted_attractions))
             return formatted_attractions
             
         except Exception as e:
-            logger.error(f"Error getting attractions along route: {e}")
+            logger.error("Error getting attractions along route: %s", e)
             raise
 
     def get_route_points_coordinates(self, from_city: str, to_city: str) -> Dict[str, Any]:
@@ -339,13 +390,11 @@ class RouteOptimizationAPI:
             return route_points
             
         except Exception as e:
-            logger.error(f"Error getting route points coordinates: {e}")
+            logger.error("Error getting route points coordinates: %s", e)
             raise
 
     def _get_route_points(self, start_coords: tuple, end_coords: tuple) -> List[tuple]:
         try:
-            import numpy as np
-            
             num_points = 50
             lat_points = np.linspace(start_coords[0], end_coords[0], num_points)
             lng_points = np.linspace(start_coords[1], end_coords[1], num_points)
@@ -354,7 +403,7 @@ class RouteOptimizationAPI:
             return route_points
             
         except Exception as e:
-            logger.error(f"Error getting route points: {e}")
+            logger.error("Error getting route points: %s", e)
             return [start_coords, end_coords]
 
     def _load_california_attractions(self) -> List[Dict[str, Any]]:
@@ -381,34 +430,32 @@ class RouteOptimizationAPI:
             return attractions
             
         except Exception as e:
-            logger.error(f"Error loading attractions: {e}")
+            logger.error("Error loading attractions: %s", e)
             raise
 
-    def _find_attractions_near_route(self, attractions: List[Dict], route_points: List[tuple], max_distance_miles: float, max_attractions: int) -> List[Dict]:
+    def _find_attractions_near_route(self, route_points: List[tuple], max_distance_miles: float, max_attractions: int) -> List[Dict]:
         try:
-            from geopy.distance import geodesic
+            # The spatial index is built over self.attractions, so that is the only list it can search
+            attractions = self.attractions
+            logger.info("Searching %s attractions near %s route points", len(attractions), len(route_points))
+            logger.info("Max distance: %s miles, max attractions: %s", max_distance_miles, max_attractions)
+            
+            route_rad = np.radians(np.asarray(route_points, dtype=np.float64))
+            indices, distances = self.attraction_tree.query_radius(
+                route_rad, r=max_distance_miles / EARTH_RADIUS_MILES, return_distance=True
+            )
             
-            logger.info(f"Searching {len(attractions)} attractions near {len(route_points)} route points")
-            logger.info(f"Max distance: {max_distance_miles} miles, max attractions: {max_attractions}")
+            min_distance = np.full(len(attractions), np.inf)
+            np.minimum.at(min_distance, np.concatenate(indices), np.concatenate(distances))
+            min_distance *= EARTH_RADIUS_MILES
             
             nearby_attractions = []
+            for i in np.flatnonzero(np.isfinite(min_distance)):
+                attraction = attractions[i]
+                attraction['distance_from_route'] = float(min_distance[i])
+                nearby_attractions.append(attraction)
             
-            for attraction in attractions:
-                attraction_coords = (attraction['latitude'], attraction['longitude'])
-                min_distance = float('inf')
-                
-                for route_point in route_points:
-                    distance = geodesic(attraction_coords, route_point).miles
-                    if distance < min_distance:
-                        min_distance = distance
-                
-                max_allowed_distance = max_distance_miles
-                
-                if min_distance <= max_allowed_distance:
-                    attraction['distance_from_route'] = min_distance
-                    nearby_attractions.append(attraction)
-            
-            logger.info(f"Found {len(nearby_attractions)} attractions within {max_distance_miles} miles")
+            logger.info("Found %s attractions within %s miles", len(nearby_attractions), max_distance_miles)
             
             nearby_attractions.sort(key=lambda x: x['distance_from_route'])
             
@@ -434,9 +481,9 @@ class RouteOptimizationAPI:
                 if len(unique_attractions) >= max_attractions:
                     break
             
-            logger.info(f"Returning {len(unique_attractions)} unique attractions")
+            logger.info("Returning %s unique attractions", len(unique_attractions))
             return unique_attractions[:max_attractions]
             
         except Exception as e:
-            logger.error(f"Error finding attractions near route: {e}")
+            logger.error("Error finding attractions near route: %s", e)
             raise 
\ No newline at end of file
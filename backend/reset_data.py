@@ -1,15 +1,17 @@
 #!/usr/bin/env python3
 
-import os
+from pathlib import Path
 import shutil
 
 def reset_data():
     
-    if os.path.exists("data/processed_data.pkl"):
-        os.remove("data/processed_data.pkl")
+    try:
+        Path("data/processed_data.pkl").unlink()
         print("✅ Removed processed data cache")
+    except FileNotFoundError:
+        pass
     
-    if os.path.exists("data/locations.csv"):
+    if Path("data/locations.csv").exists():
         print("✅ Locations file is ready with USA locations")
     
     print("✅ Data reset complete!")
@@ -17,4 +19,4 @@ def reset_data():
     print("   python3 start_api.py")
 
 if __name__ == "__main__":
-    reset_data() 
\ No newline at end of file
+    reset_data() 
@@ -3,16 +3,50 @@ Data loading utilities for the route optimization system.
 Handles loading and preprocessing of location data.
 """
 
-import csv
 import numpy as np
+import pandas as pd
 import logging
 from typing import List, Dict, Tuple
 import os
 
+try:
+    import pyarrow  # noqa: F401
+    CSV_ENGINE = 'pyarrow'
+except ImportError:
+    # pyarrow is optional; pandas' C parser is used without it
+    CSV_ENGINE = 'c'
+
 # Set up logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+LOCATION_COLUMNS = {'location_name': str, 'latitude': np.float64, 'longitude': np.float64}
+
+def load_locations(file_path: str) -> pd.DataFrame:
+    """
+    Load the location columns from a CSV file.
+    
+    Args:
+        file_path (str): Path to the CSV file containing location data
+        
+    Returns:
+        pd.DataFrame: Frame with location_name, latitude and longitude columns
+    """
+    return pd.read_csv(file_path, usecols=list(LOCATION_COLUMNS), dtype=LOCATION_COLUMNS, engine=CSV_ENGINE)
+
+def get_coordinate_columns(df: pd.DataFrame) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Split a location frame into separate float32 latitude and longitude arrays.
+    
+    Args:
+        df (pd.DataFrame): Frame returned by load_locations
+        
+    Returns:
+        Tuple[np.ndarray, np.ndarray]: Latitude and longitude arrays
+    """
+    # float32 keeps ~7 significant digits, about a metre at these magnitudes
+    return df['latitude'].to_numpy(dtype=np.float32), df['longitude'].to_numpy(dtype=np.float32)
+
 class DataLoader:
     """
     Data loader for location information.
@@ -26,9 +60,21 @@ class DataLoader:
             data_file (str): Path to the CSV file containing location data
         """
         self.data_file = data_file
-        self.locations = []
-        self.coordinates = None
+        self.locations = None
+        # Latitudes and longitudes live in separate contiguous arrays
+        self.lat = None
+        self.lon = None
         self.location_names = []
+        self._lat_buffer = None
+        self._lon_buffer = None
+        self._validated = False
+    
+    @property
+    def coordinates(self) -> np.ndarray:
+        """(N, 2) [lat, lon] array assembled from the separate columns."""
+        if self.lat is None:
+            return None
+        return np.column_stack((self.lat, self.lon))
     
     def load_data(self) -> Tuple[np.ndarray, List[str]]:
         """
@@ -41,22 +87,14 @@ class DataLoader:
             if not os.path.exists(self.data_file):
                 raise FileNotFoundError(f"Data file not found: {self.data_file}")
             
-            locations = []
-            with open(self.data_file, 'r', encoding='utf-8') as file:
-                reader = csv.DictReader(file)
-                for i, row in enumerate(reader):
-                    locations.append({
-                        'id': i,  # Generate ID based on row index
-                        'name': row['location_name'],
-                        'latitude': float(row['latitude']),
-                        'longitude': float(row['longitude'])
-                    })
-            
-            self.locations = locations
-            self.location_names = [loc['name'] for loc in locations]
-            self.coordinates = np.array([[loc['latitude'], loc['longitude']] for loc in locations])
+            df = load_locations(self.data_file)
+            self.lat, self.lon = get_coordinate_columns(df)
+            self.location_names = df['location_name'].tolist()
+            # Location dicts are only built if get_locations() asks for them
+            self.locations = None
+            self._validated = False
             
-            logger.info(f"Successfully loaded {len(locations)} locations from {self.data_file}")
+            logger.info(f"Successfully loaded {len(df)} locations from {self.data_file}")
             return self.coordinates, self.location_names
             
         except Exception as e:
@@ -70,26 +108,20 @@ class DataLoader:
         Returns:
             bool: True if data is valid, False otherwise
         """
-        if not self.locations:
+        if self.lat is None or len(self.lat) == 0:
             logger.error("No locations loaded")
             return False
         
-        for i, location in enumerate(self.locations):
-            # Check required fields
-            if not all(key in location for key in ['id', 'name', 'latitude', 'longitude']):
-                logger.error(f"Missing required fields in location {i}")
-                return False
-            
-            # Validate coordinate ranges
-            lat, lon = location['latitude'], location['longitude']
-            if not (-90 <= lat <= 90):
-                logger.error(f"Invalid latitude {lat} for location {location['name']}")
-                return False
-            if not (-180 <= lon <= 180):
-                logger.error(f"Invalid longitude {lon} for location {location['name']}")
+        # Required columns are enforced by read_csv(usecols=...); only the ranges need checking
+        for label, values, limit in (('latitude', self.lat, 90), ('longitude', self.lon, 180)):
+            invalid = np.flatnonzero(~((values >= -limit) & (values <= limit)))
+            if invalid.size:
+                examples = [(self.location_names[i], float(values[i])) for i in invalid[:5]]
+                logger.error(f"Invalid {label} for {invalid.size} locations, e.g. {examples}")
                 return False
         
-        logger.info("Data validation complete. {} valid locations remaining".format(len(self.locations)))
+        logger.info("Data validation complete. {} valid locations remaining".format(len(self.lat)))
+        self._validated = True
         return True
     
     def preprocess_data(self) -> Tuple[np.ndarray, List[str]]:
@@ -99,12 +131,12 @@ class DataLoader:
         Returns:
             Tuple[np.ndarray, List[str]]: Processed coordinates and names
         """
-        if not self.validate_data():
+        # add_location range-checks its input, so a validated dataset stays valid until the next load
+        if not self._validated and not self.validate_data():
             raise ValueError("Data validation failed")
         
-        # Ensure coordinates are in the correct format
-        coordinates = np.array([[loc['latitude'], loc['longitude']] for loc in self.locations])
-        location_names = [loc['name'] for loc in self.locations]
+        coordinates = self.coordinates
+        location_names = list(self.location_names)
         
         logger.info("Data preprocessing complete. Ready for modeling with {} locations".format(len(location_names)))
         return coordinates, location_names
@@ -116,6 +148,14 @@ class DataLoader:
         Returns:
             List[Dict]: List of location dictionaries
         """
+        if self.locations is None:
+            # Go through the shortest float32 repr so 37.7749 doesn't come back as 37.77490234375
+            lats = self.lat.astype(str).astype(float).tolist() if self.lat is not None else []
+            lons = self.lon.astype(str).astype(float).tolist() if self.lon is not None else []
+            self.locations = [
+                {'id': i, 'name': name, 'latitude': lat, 'longitude': lon}  # ID is the row index
+                for i, (name, lat, lon) in enumerate(zip(self.location_names, lats, lons))
+            ]
         return self.locations
     
     def add_location(self, name: str, latitude: float, longitude: float) -> int:
@@ -136,24 +176,44 @@ class DataLoader:
         if not (-180 <= longitude <= 180):
             raise ValueError(f"Invalid longitude: {longitude}")
         
-        # Generate new ID
-        new_id = max([loc['id'] for loc in self.locations]) + 1 if self.locations else 0
-        
-        new_location = {
-            'id': new_id,
-            'name': name,
-            'latitude': latitude,
-            'longitude': longitude
-        }
+        # IDs are row indices, so the next one is the current count
+        new_id = len(self.location_names)
         
-        self.locations.append(new_location)
+        if self.locations is not None:
+            self.locations.append({
+                'id': new_id,
+                'name': name,
+                'latitude': latitude,
+                'longitude': longitude
+            })
         self.location_names.append(name)
-        
-        # Update coordinates array
-        if self.coordinates is None:
-            self.coordinates = np.array([[latitude, longitude]])
-        else:
-            self.coordinates = np.vstack([self.coordinates, [latitude, longitude]])
+        self._append_coordinates(latitude, longitude)
         
         logger.info(f"Added location: {name} (ID: {new_id})")
-        return new_id 
\ No newline at end of file
+        return new_id 
+    
+    def _append_coordinates(self, latitude: float, longitude: float):
+        """
+        Append one point to the latitude and longitude arrays in amortized O(1).
+        
+        Args:
+            latitude (float): Latitude coordinate
+            longitude (float): Longitude coordinate
+        """
+        count = 0 if self.lat is None else len(self.lat)
+        lat_buffer, lon_buffer = self._lat_buffer, self._lon_buffer
+        
+        # Grow geometrically, and start over if the arrays were replaced (e.g. by load_data)
+        if lat_buffer is None or count == len(lat_buffer) or self.lat is None or self.lat.base is not lat_buffer:
+            size = max(2 * count, 16)
+            lat_buffer = np.empty(size, dtype=np.float32)
+            lon_buffer = np.empty(size, dtype=np.float32)
+            if count:
+                lat_buffer[:count] = self.lat
+                lon_buffer[:count] = self.lon
+            self._lat_buffer, self._lon_buffer = lat_buffer, lon_buffer
+        
+        lat_buffer[count] = latitude
+        lon_buffer[count] = longitude
+        self.lat = lat_buffer[:count + 1]
+        self.lon = lon_buffer[:count + 1]
@@ -4,11 +4,12 @@ Optimizes routes using evolutionary algorithms.
 """
 
 import numpy as np
-import random
 import time
 import logging
 from typing import List, Tuple, Dict
 
+from distance_calculator import tour_distance, population_distances, two_opt_pass
+
 logger = logging.getLogger(__name__)
 
 class GeneticAlgorithmTSP:
@@ -17,7 +18,8 @@ class GeneticAlgorithmTSP:
     """
     
     def __init__(self, population_size: int = 50, mutation_rate: float = 0.01, 
-                 crossover_rate: float = 0.8, elite_size: int = 5):
+                 crossover_rate: float = 0.8, elite_size: int = 5, seed: int = None,
+                 two_opt: bool = True):
         """
         Initialize the genetic algorithm.
         
@@ -26,17 +28,21 @@ class GeneticAlgorithmTSP:
             mutation_rate (float): Probability of mutation
             crossover_rate (float): Probability of crossover
             elite_size (int): Number of elite individuals to preserve
+            seed (int): Random seed for reproducibility
+            two_opt (bool): Polish elite individuals with 2-opt local search each generation
         """
         self.population_size = population_size
         self.mutation_rate = mutation_rate
         self.crossover_rate = crossover_rate
         self.elite_size = elite_size
+        self.rng = np.random.default_rng(seed)
+        self.two_opt = two_opt
         self.best_route = None
         self.best_distance = float('inf')
         
         logger.info(f"GeneticAlgorithmTSP initialized with population_size={population_size}")
     
-    def create_individual(self, num_locations: int) -> List[int]:
+    def create_individual(self, num_locations: int) -> np.ndarray:
         """
         Create a random individual (route).
         
@@ -44,11 +50,11 @@ class GeneticAlgorithmTSP:
             num_locations (int): Number of locations
             
         Returns:
-            List[int]: Random route
+            np.ndarray: Random route
         """
-        return random.sample(range(num_locations), num_locations)
+        return self.rng.permutation(num_locations).astype(np.int32)
     
-    def create_initial_population(self, num_locations: int) -> List[List[int]]:
+    def create_initial_population(self, num_locations: int) -> np.ndarray:
         """
         Create initial population of routes.
         
@@ -56,164 +62,252 @@ class GeneticAlgorithmTSP:
             num_locations (int): Number of locations
             
         Returns:
-            List[List[int]]: Initial population
+            np.ndarray: Initial population, one route per row
         """
-        population = []
-        for _ in range(self.population_size):
-            individual = self.create_individual(num_locations)
-            population.append(individual)
+        # Argsorting rows of uniform draws gives every route in one call
+        population = self.rng.random((self.population_size, num_locations)).argsort(axis=1).astype(np.int32)
         
         logger.info(f"Created initial population of {self.population_size} individuals")
         return population
     
-    def calculate_fitness(self, route: List[int], distance_calculator) -> float:
+    def calculate_fitness(self, route: np.ndarray, distance_calculator) -> float:
         """
         Calculate fitness (inverse of distance) for a route.
         
         Args:
-            route (List[int]): Route to evaluate
+            route (np.ndarray): Route to evaluate
             distance_calculator: DistanceCalculator instance
             
         Returns:
             float: Fitness value (higher is better)
         """
-        distance = distance_calculator.calculate_route_distance(route)
+        distance = tour_distance(np.asarray(route, dtype=np.int64), distance_calculator.distance_matrix)
         return 1.0 / distance  # Inverse of distance
     
-    def rank_population(self, population: List[List[int]], distance_calculator) -> List[Tuple[int, float]]:
+    def rank_population(self, population: np.ndarray, distance_calculator,
+                        distances: np.ndarray = None) -> Tuple[np.ndarray, np.ndarray]:
         """
-        Rank population by fitness.
+        Rank population from shortest to longest route.
         
         Args:
-            population (List[List[int]]): Population to rank
+            population (np.ndarray): Population to rank
             distance_calculator: DistanceCalculator instance
+            distances (np.ndarray): Route distance per individual, if already known
             
         Returns:
-            List[Tuple[int, float]]: Ranked population with indices and fitness
+            Tuple[np.ndarray, np.ndarray]: Population indices best-first and their distances
         """
-        fitness_results = {}
-        for i, route in enumerate(population):
-            fitness_results[i] = self.calculate_fitness(route, distance_calculator)
+        if distances is None:
+            distances = population_distances(population, distance_calculator.distance_matrix)
         
-        return sorted(fitness_results.items(), key=lambda x: x[1], reverse=True)
+        # Fitness is monotone in distance, so ranking needs no reciprocal
+        order = np.argsort(distances, kind='stable')
+        return order, distances[order]
     
-    def selection(self, ranked_population: List[Tuple[int, float]]) -> List[List[int]]:
+    def selection(self, ranked_population: Tuple[np.ndarray, np.ndarray]) -> np.ndarray:
         """
         Select individuals for breeding using tournament selection.
         
         Args:
-            ranked_population (List[Tuple[int, float]]): Ranked population
+            ranked_population (Tuple[np.ndarray, np.ndarray]): Ranking from rank_population
             
         Returns:
-            List[List[int]]: Selected individuals
+            np.ndarray: Population indices of the selected individuals
         """
-        selection_results = []
-        for i in range(self.elite_size):
-            selection_results.append(ranked_population[i][0])
-        
-        # Tournament selection for the rest
-        for i in range(self.population_size - self.elite_size):
-            tournament_size = 3
-            tournament = random.sample(ranked_population, tournament_size)
-            winner = max(tournament, key=lambda x: x[1])
-            selection_results.append(winner[0])
-        
-        return selection_results
+        order, _ = ranked_population
+        
+        # Tournament selection for the rest, every tournament drawn in one call; the
+        # ranking is best-first, so the winner is the contestant with the lowest rank
+        tournament_size = 3
+        num_tournaments = self.population_size - self.elite_size
+        contestants = self.rng.integers(0, len(order), size=(num_tournaments, tournament_size))
+        winners = contestants.min(axis=1)
+        
+        return np.concatenate((order[:self.elite_size], order[winners]))
     
-    def crossover(self, parent1: List[int], parent2: List[int]) -> List[int]:
+    def crossover(self, parent1: np.ndarray, parent2: np.ndarray) -> np.ndarray:
         """
         Perform ordered crossover (OX) between two parents.
         
         Args:
-            parent1, parent2 (List[int]): Parent routes
+            parent1, parent2 (np.ndarray): Parent routes
             
         Returns:
-            List[int]: Offspring route
+            np.ndarray: Offspring route
         """
-        if random.random() > self.crossover_rate:
-            return parent1
+        if self.rng.random() > self.crossover_rate:
+            return parent1.copy()
         
-        size = len(parent1)
-        start, end = sorted(random.sample(range(size), 2))
-        
-        # Create child with segment from parent1
-        child = [-1] * size
-        child[start:end] = parent1[start:end]
+        start, end = self._cut_points(len(parent1), 1)[0]
+        return self._ordered_crossover(parent1, parent2, start, end)
+    
+    def _cut_points(self, size: int, count: int) -> np.ndarray:
+        """
+        Draw pairs of distinct positions, each pair sorted ascending.
         
-        # Fill remaining positions with elements from parent2
-        remaining = [x for x in parent2 if x not in child[start:end]]
-        j = 0
-        for i in range(size):
-            if child[i] == -1:
-                child[i] = remaining[j]
-                j += 1
+        Args:
+            size (int): Route length
+            count (int): Number of pairs to draw
+            
+        Returns:
+            np.ndarray: (count, 2) array of positions
+        """
+        # An offset in [1, size) from the first position keeps the pair distinct
+        first = self.rng.integers(0, size, count)
+        second = (first + self.rng.integers(1, size, count)) % size
+        return np.sort(np.column_stack((first, second)), axis=1)
+    
+    @staticmethod
+    def _ordered_crossover(parent1: np.ndarray, parent2: np.ndarray, start: int, end: int) -> np.ndarray:
+        """
+        Ordered crossover (OX) for a given segment.
         
-        return child
+        Args:
+            parent1, parent2 (np.ndarray): Parent routes
+            start, end (int): Segment of parent1 to keep
+            
+        Returns:
+            np.ndarray: Offspring route
+        """
+        # Keep the segment from parent1 and fill the positions around it, in order,
+        # with parent2's remaining elements
+        segment = parent1[start:end]
+        in_segment = np.zeros(len(parent1), dtype=bool)
+        in_segment[segment] = True
+        remaining = parent2[~in_segment[parent2]]
+        
+        return np.concatenate((remaining[:start], segment, remaining[start:]))
     
-    def mutate(self, route: List[int]) -> List[int]:
+    def mutate(self, route: np.ndarray) -> np.ndarray:
         """
         Perform swap mutation on a route.
         
         Args:
-            route (List[int]): Route to mutate
+            route (np.ndarray): Route to mutate
             
         Returns:
-            List[int]: Mutated route
+            np.ndarray: Mutated route
         """
-        if random.random() < self.mutation_rate:
-            i, j = random.sample(range(len(route)), 2)
+        if self.rng.random() < self.mutation_rate:
+            i, j = self._cut_points(len(route), 1)[0]
             route[i], route[j] = route[j], route[i]
         
         return route
     
-    def breed_population(self, mating_pool: List[List[int]]) -> List[List[int]]:
+    def breed_population(self, mating_pool: np.ndarray) -> np.ndarray:
         """
         Breed new population from mating pool.
         
         Args:
-            mating_pool (List[List[int]]): Selected individuals
+            mating_pool (np.ndarray): Selected individuals
+            
+        Returns:
+            np.ndarray: New population
+        """
+        children, _ = self._breed(mating_pool)
+        return children
+    
+    def _breed(self, mating_pool: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Breed new population from mating pool, tracking which children differ from their source row.
+        
+        Args:
+            mating_pool (np.ndarray): Selected individuals
             
         Returns:
-            List[List[int]]: New population
+            Tuple[np.ndarray, np.ndarray]: New population and, per child, the mating pool row
+            it was copied from, or -1 if crossover or mutation produced a new route
         """
-        children = []
+        source = np.arange(len(mating_pool))
+        # A single-stop route has no distinct cut points and only one ordering
+        if mating_pool.shape[1] < 2:
+            return mating_pool.copy(), source
+        
+        children = np.empty_like(mating_pool)
         
         # Keep elite individuals
-        for i in range(self.elite_size):
-            children.append(mating_pool[i])
+        children[:self.elite_size] = mating_pool[:self.elite_size]
+        
+        # Breed the rest, drawing every random choice for the generation up front
+        num_children = self.population_size - self.elite_size
+        size = mating_pool.shape[1]
+        parents = self.rng.integers(0, len(mating_pool), size=(num_children, 2))
+        crossed = self.rng.random(num_children) <= self.crossover_rate
+        cuts = self._cut_points(size, num_children)
+        
+        for i in range(num_children):
+            parent1, parent2 = mating_pool[parents[i, 0]], mating_pool[parents[i, 1]]
+            if crossed[i]:
+                children[self.elite_size + i] = self._ordered_crossover(parent1, parent2, *cuts[i])
+            else:
+                children[self.elite_size + i] = parent1
+        source[self.elite_size:] = np.where(crossed, -1, parents[:, 0])
+        
+        # Swap mutation on the children that drew one, all in one fancy-indexed swap
+        mutants = self.elite_size + np.flatnonzero(self.rng.random(num_children) < self.mutation_rate)
+        i, j = self._cut_points(size, len(mutants)).T
+        children[mutants, i], children[mutants, j] = children[mutants, j], children[mutants, i]
+        source[mutants] = -1
+        
+        return children, source
+    
+    def polish_elites(self, population: np.ndarray, distance_calculator) -> np.ndarray:
+        """
+        Run 2-opt on the elite rows of a population until no move improves them.
         
-        # Breed the rest
-        for i in range(self.population_size - self.elite_size):
-            parent1 = random.choice(mating_pool)
-            parent2 = random.choice(mating_pool)
-            child = self.crossover(parent1, parent2)
-            child = self.mutate(child)
-            children.append(child)
+        Args:
+            population (np.ndarray): Population whose first elite_size rows are the elites; modified in place
+            distance_calculator: DistanceCalculator instance
+            
+        Returns:
+            np.ndarray: Per elite, whether 2-opt changed the route
+        """
+        changed = np.zeros(self.elite_size, dtype=bool)
         
-        return children
+        # Elites carried over already at a local optimum cost one scan to confirm it
+        for k, route in enumerate(population[:self.elite_size]):
+            while two_opt_pass(route, distance_calculator.distance_matrix) < 0:
+                changed[k] = True
+        return changed
     
-    def evolve_population(self, population: List[List[int]], distance_calculator) -> List[List[int]]:
+    def evolve_population(self, population: np.ndarray, distance_calculator,
+                          ranked_population: Tuple[np.ndarray, np.ndarray] = None) -> Tuple[np.ndarray, Tuple[np.ndarray, np.ndarray]]:
         """
         Evolve population for one generation.
         
         Args:
-            population (List[List[int]]): Current population
+            population (np.ndarray): Current population
             distance_calculator: DistanceCalculator instance
+            ranked_population (Tuple[np.ndarray, np.ndarray]): Ranking of population, if already known
             
         Returns:
-            List[List[int]]: Evolved population
+            Tuple[np.ndarray, Tuple[np.ndarray, np.ndarray]]: Evolved population and its ranking
         """
         # Rank population
-        ranked_population = self.rank_population(population, distance_calculator)
+        if ranked_population is None:
+            ranked_population = self.rank_population(population, distance_calculator)
+        order, sorted_distances = ranked_population
+        distances = np.empty(len(order))
+        distances[order] = sorted_distances
         
         # Selection
         selection_results = self.selection(ranked_population)
-        mating_pool = [population[i] for i in selection_results]
+        mating_pool = population[selection_results]
         
         # Breeding
-        children = self.breed_population(mating_pool)
+        children, source = self._breed(mating_pool)
         
-        return children
+        if self.two_opt:
+            source[:self.elite_size][self.polish_elites(children, distance_calculator)] = -1
+        
+        # Children copied unchanged keep their known distance; only new routes are evaluated
+        child_distances = distances[selection_results][np.maximum(source, 0)]
+        changed = np.flatnonzero(source < 0)
+        if changed.size:
+            child_distances[changed] = population_distances(children[changed], distance_calculator.distance_matrix)
+        
+        # The children's ranking doubles as the next generation's input ranking
+        return children, self.rank_population(children, distance_calculator, child_distances)
     
     def optimize(self, distance_calculator, num_generations: int = 100) -> List[int]:
         """
@@ -238,20 +332,20 @@ class GeneticAlgorithmTSP:
         
         logger.info(f"Starting optimization with {num_generations} generations")
         
+        ranked_population = None
         for generation in range(num_generations):
             # Evolve population
-            population = self.evolve_population(population, distance_calculator)
+            population, ranked_population = self.evolve_population(population, distance_calculator, ranked_population)
             
             # Track best route
-            ranked_population = self.rank_population(population, distance_calculator)
-            best_route_idx = ranked_population[0][0]
-            best_route = population[best_route_idx]
+            order, distances = ranked_population
+            best_route = population[order[0]]
             
-            best_distance = distance_calculator.calculate_route_distance(best_route)
+            best_distance = float(distances[0])
             
             if best_distance < self.best_distance:
                 self.best_distance = best_distance
-                self.best_route = best_route.copy()
+                self.best_route = best_route.tolist()
             
             progress.append(generation)
             best_distances.append(best_distance)
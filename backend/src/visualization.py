@@ -4,14 +4,132 @@ Simplified for web deployment without heavy dependencies.
 """
 
 import numpy as np
+import orjson
 from typing import List, Dict, Tuple
 import logging
-import requests
-import json
 import time
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
 
 logger = logging.getLogger(__name__)
 
+class _TokenBucket:
+    """Thread-safe token bucket: bursts up to `rate` calls, then `rate` per `per` seconds."""
+    
+    def __init__(self, rate: int, per: float):
+        self.capacity = float(rate)
+        self.tokens = float(rate)
+        self.fill_rate = rate / per
+        self.updated = time.monotonic()
+        self.lock = threading.Lock()
+    
+    def acquire(self):
+        with self.lock:
+            now = time.monotonic()
+            self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.fill_rate)
+            self.updated = now
+            # Take the token even if it isn't there yet, so later callers queue behind this one
+            self.tokens -= 1
+            wait = -self.tokens / self.fill_rate if self.tokens < 0 else 0.0
+        if wait:
+            time.sleep(wait)
+
+# OpenRouteService free tier allows 40 directions requests per minute
+_ORS_RATE_LIMIT = _TokenBucket(40, 60.0)
+
+@lru_cache(maxsize=None)
+def _ors_session():
+    """
+    Shared session so segment requests reuse pooled keep-alive connections instead of
+    paying a TCP + TLS handshake each; sized for RouteVisualizer's worker threads.
+    
+    requests is only imported once a routing API key is actually used.
+    """
+    import requests
+    from requests.adapters import HTTPAdapter
+    
+    session = requests.Session()
+    session.mount("https://", HTTPAdapter(pool_connections=1, pool_maxsize=8))
+    return session
+
+@lru_cache(maxsize=4096)
+def _fetch_route(start_lat: float, start_lon: float, end_lat: float, end_lon: float,
+                 api_key: str, base_url: str) -> Tuple[Tuple[float, float], ...]:
+    """
+    Fetch the road route between two points from OpenRouteService.
+    
+    Failed requests raise, so only successful routes end up in the cache.
+    
+    Returns:
+        Tuple[Tuple[float, float], ...]: Coordinates (lat, lon) along the road route
+    """
+    headers = {
+        'Authorization': f'Bearer {api_key}',
+        'Content-Type': 'application/json'
+    }
+    
+    payload = {
+        "coordinates": [
+            [start_lon, start_lat],  # [lon, lat]
+            [end_lon, end_lat]       # [lon, lat]
+        ],
+        "format": "geojson"
+    }
+    
+    _ORS_RATE_LIMIT.acquire()
+    response = _ors_session().post(base_url, headers=headers, json=payload, timeout=10)
+    if response.status_code != 200:
+        raise RuntimeError(f"Routing API failed: {response.status_code}")
+    
+    # orjson decodes the raw bytes directly, skipping requests' text decoding and stdlib json
+    data = orjson.loads(response.content)
+    coordinates = data['features'][0]['geometry']['coordinates']
+    # Convert [lon, lat] to [lat, lon]
+    return tuple((coord[1], coord[0]) for coord in coordinates)
+
+def simplify_path(points: np.ndarray, tolerance: float) -> np.ndarray:
+    """
+    Decimate a polyline with the Ramer-Douglas-Peucker algorithm.
+    
+    Args:
+        points (np.ndarray): (n, 2) array of path coordinates
+        tolerance (float): Largest allowed deviation from the original path, in degrees
+        
+    Returns:
+        np.ndarray: The retained points, endpoints always included
+    """
+    n = len(points)
+    if n < 3:
+        return points
+    
+    keep = np.zeros(n, dtype=bool)
+    keep[0] = keep[-1] = True
+    stack = [(0, n - 1)]
+    while stack:
+        first, last = stack.pop()
+        if last - first < 2:
+            continue
+        
+        # Perpendicular distance of the interior points from the first-last chord
+        start, end = points[first], points[last]
+        chord = end - start
+        offsets = points[first + 1:last] - start
+        length = np.hypot(chord[0], chord[1])
+        if length == 0:
+            deviation = np.hypot(offsets[:, 0], offsets[:, 1])
+        else:
+            deviation = np.abs(chord[0] * offsets[:, 1] - chord[1] * offsets[:, 0]) / length
+        
+        farthest = int(deviation.argmax())
+        if deviation[farthest] > tolerance:
+            split = first + 1 + farthest
+            keep[split] = True
+            stack.append((first, split))
+            stack.append((split, last))
+    
+    return points[keep]
+
 class RouteVisualizer:
     """
     Simplified visualization class for route optimization results.
@@ -28,6 +146,10 @@ class RouteVisualizer:
         # OpenRouteService API key (free tier available)
         self.routing_api_key = None  # Will be set if available
         self.routing_base_url = "https://api.openrouteservice.org/v2/directions/driving-car"
+        # Concurrent segment requests when routing through the API
+        self.routing_workers = 8
+        # Road paths are decimated to this many degrees (~100 m) before being returned
+        self.path_tolerance = 1e-3
     
     def get_road_route(self, start_coords: Tuple[float, float], 
                        end_coords: Tuple[float, float]) -> List[Tuple[float, float]]:
@@ -41,37 +163,15 @@ class RouteVisualizer:
         Returns:
             List[Tuple[float, float]]: List of coordinates along the road route
         """
-        try:
-            # For now, return straight line if no API key
-            # In production, you would use a real routing service
+        if self.routing_api_key is None:
+            # Without an API key there is no road geometry; use a straight line
             return [start_coords, end_coords]
-            
-            # Uncomment below when you have an API key
-            # headers = {
-            #     'Authorization': f'Bearer {self.routing_api_key}',
-            #     'Content-Type': 'application/json'
-            # }
-            # 
-            # payload = {
-            #     "coordinates": [
-            #         [start_coords[1], start_coords[0]],  # [lon, lat]
-            #         [end_coords[1], end_coords[0]]       # [lon, lat]
-            #     ],
-            #     "format": "geojson"
-            # }
-            # 
-            # response = requests.post(self.routing_base_url, 
-            #                          headers=headers, 
-            #                          json=payload)
-            # 
-            # if response.status_code == 200:
-            #     data = response.json()
-            #     coordinates = data['features'][0]['geometry']['coordinates']
-            #     # Convert [lon, lat] to [lat, lon]
-            #     return [(coord[1], coord[0]) for coord in coordinates]
-            # else:
-            #     logger.warning(f"Routing API failed: {response.status_code}")
-            #     return [start_coords, end_coords]
+        
+        try:
+            # ~1 m rounding lets nearly identical requests share a cache entry
+            return list(_fetch_route(round(start_coords[0], 5), round(start_coords[1], 5),
+                                     round(end_coords[0], 5), round(end_coords[1], 5),
+                                     self.routing_api_key, self.routing_base_url))
                 
         except Exception as e:
             logger.warning(f"Error getting road route: {e}")
@@ -88,24 +188,49 @@ class RouteVisualizer:
         Returns:
             List[Tuple[float, float]]: Complete road path coordinates
         """
-        path = []
+        if len(route_indices) < 2:
+            return []
         
-        for i in range(len(route_indices) - 1):
-            start_idx = route_indices[i]
-            end_idx = route_indices[i + 1]
-            
-            start_coords = (coordinates[start_idx, 0], coordinates[start_idx, 1])
-            end_coords = (coordinates[end_idx, 0], coordinates[end_idx, 1])
-            
-            # Get road route between these points
-            segment_path = self.get_road_route(start_coords, end_coords)
-            path.extend(segment_path)
-            
-            # Add small delay to avoid API rate limits
-            time.sleep(0.1)
+        points = np.asarray(coordinates, dtype=float)[np.asarray(route_indices)]
+        
+        # Without a routing API every segment is a straight line, so the path is just the waypoints
+        if self.routing_api_key is None:
+            return list(zip(points[:, 0].tolist(), points[:, 1].tolist()))
+        
+        waypoints = list(map(tuple, points.tolist()))
+        
+        # Segments are independent requests; _fetch_route's token bucket keeps them under the API rate limit
+        with ThreadPoolExecutor(max_workers=self.routing_workers) as executor:
+            segments = executor.map(self.get_road_route, waypoints[:-1], waypoints[1:])
+            path = []
+            for segment_path in segments:
+                # Each segment starts where the previous one ended; keep that shared point once
+                path.extend(segment_path[1:] if path else segment_path)
         
         return path
     
+    def _path_lat_lon(self, route_indices: List[int], coordinates: np.ndarray) -> Tuple[List[float], List[float]]:
+        """
+        Get a route's path as separate latitude and longitude lists.
+        
+        Args:
+            route_indices (List[int]): Route location indices
+            coordinates (np.ndarray): All location coordinates
+            
+        Returns:
+            Tuple[List[float], List[float]]: Path latitudes and longitudes
+        """
+        if self.routing_api_key is None and len(route_indices) >= 2:
+            # Straight-line path: index the waypoints directly instead of going through tuples
+            points = np.asarray(coordinates)[np.asarray(route_indices)]
+        else:
+            # Road geometry can run to thousands of vertices; drop the ones that don't change the drawn line
+            points = np.asarray(self.get_route_path(route_indices, coordinates), dtype=np.float64).reshape(-1, 2)
+            points = simplify_path(points, self.path_tolerance)
+        # 5 decimals is ~1 m; widening first keeps float32 coordinates from serializing as 16-digit reprs
+        points = np.round(points.astype(np.float64, copy=False), 5)
+        return points[:, 0].tolist(), points[:, 1].tolist()
+    
     def create_route_summary(self, coordinates: np.ndarray, location_names: List[str],
                            baseline_route: List[int], optimized_route: List[int],
                            baseline_distance: float, optimized_distance: float) -> Dict:
@@ -123,15 +248,10 @@ class RouteVisualizer:
         Returns:
             Dict: Route comparison summary
         """
-        # Get road paths for routes
-        baseline_path = self.get_route_path(baseline_route, coordinates)
-        optimized_path = self.get_route_path(optimized_route, coordinates)
-        
-        # Convert paths to separate lat/lon arrays
-        baseline_lats = [coord[0] for coord in baseline_path]
-        baseline_lons = [coord[1] for coord in baseline_path]
-        optimized_lats = [coord[0] for coord in optimized_path]
-        optimized_lons = [coord[1] for coord in optimized_path]
+        # Get road paths for routes as separate lat/lon lists
+        baseline_lats, baseline_lons = self._path_lat_lon(baseline_route, coordinates)
+        optimized_lats, optimized_lons = self._path_lat_lon(optimized_route, coordinates)
+        distance_saved = baseline_distance - optimized_distance
         
         summary = {
             'baseline_route': {
@@ -151,8 +271,8 @@ class RouteVisualizer:
                 'distance': optimized_distance
             },
             'improvement': {
-                'distance_saved': baseline_distance - optimized_distance,
-                'improvement_percentage': ((baseline_distance - optimized_distance) / baseline_distance) * 100
+                'distance_saved': distance_saved,
+                'improvement_percentage': (distance_saved / baseline_distance) * 100
             }
         }
         
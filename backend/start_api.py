@@ -37,18 +37,20 @@ def main():
     print("   - POST /street-routing  - Get street routing data")
     print("   - GET  /quick-optimize  - Quick optimization")
     print("   - GET  /stats           - API statistics")
+    print("   - POST /batch           - Run several requests in one call")
     
     print("\n🛑 Press Ctrl+C to stop the server")
     print("=" * 50)
     
+    import uvicorn
+    
     try:
-        subprocess.run([
-            sys.executable, "-m", "uvicorn", 
-            "web_api:app", 
-            "--host", "0.0.0.0", 
-            "--port", "8000", 
-            "--reload"
-        ])
+        uvicorn.run(
+            "web_api:app",
+            host="0.0.0.0",
+            port=8000,
+            reload=True
+        )
     except KeyboardInterrupt:
         print("\n👋 API server stopped")
 
@@ -7,14 +7,16 @@ Run this to verify all endpoints are working correctly.
 import requests
 import json
 import time
+from concurrent.futures import ThreadPoolExecutor
 
 BASE_URL = "http://localhost:8000"
+SESSION = requests.Session()
 
 def test_health():
     """Test health check endpoint"""
     print("🔍 Testing health check...")
     try:
-        response = requests.get(f"{BASE_URL}/health")
+        response = SESSION.get(f"{BASE_URL}/health")
         if response.status_code == 200:
             data = response.json()
             print(f"✅ Health check passed: {data['message']}")
@@ -30,7 +32,7 @@ def test_get_locations():
     """Test getting all locations"""
     print("\n🔍 Testing get locations...")
     try:
-        response = requests.get(f"{BASE_URL}/locations")
+        response = SESSION.get(f"{BASE_URL}/locations")
         if response.status_code == 200:
             data = response.json()
             locations = data['data']['locations']
@@ -49,7 +51,7 @@ def test_optimize_route(location_ids):
     """Test route optimization"""
     print(f"\n🔍 Testing route optimization for locations {location_ids}...")
     try:
-        response = requests.post(f"{BASE_URL}/optimize", json={
+        response = SESSION.post(f"{BASE_URL}/optimize", json={
             "location_ids": location_ids
         })
         if response.status_code == 200:
@@ -71,7 +73,7 @@ def test_compare_routes(location_ids):
     """Test route comparison"""
     print(f"\n🔍 Testing route comparison for locations {location_ids}...")
     try:
-        response = requests.post(f"{BASE_URL}/compare", json={
+        response = SESSION.post(f"{BASE_URL}/compare", json={
             "location_ids": location_ids
         })
         if response.status_code == 200:
@@ -94,7 +96,7 @@ def test_visualization(location_ids):
     """Test visualization data"""
     print(f"\n🔍 Testing visualization data for locations {location_ids}...")
     try:
-        response = requests.post(f"{BASE_URL}/visualization", json={
+        response = SESSION.post(f"{BASE_URL}/visualization", json={
             "route_ids": location_ids
         })
         if response.status_code == 200:
@@ -116,7 +118,7 @@ def test_street_routing(location_ids):
     """Test street routing data"""
     print(f"\n🔍 Testing street routing for locations {location_ids}...")
     try:
-        response = requests.post(f"{BASE_URL}/street-routing", json={
+        response = SESSION.post(f"{BASE_URL}/street-routing", json={
             "route_ids": location_ids
         })
         if response.status_code == 200:
@@ -142,7 +144,7 @@ def test_quick_optimize(location_ids):
     print(f"\n🔍 Testing quick optimization for locations {location_ids}...")
     try:
         location_str = ",".join(map(str, location_ids))
-        response = requests.get(f"{BASE_URL}/quick-optimize?location_ids={location_str}")
+        response = SESSION.get(f"{BASE_URL}/quick-optimize?location_ids={location_str}")
         if response.status_code == 200:
             data = response.json()
             route = data['data']['optimized_route']
@@ -166,7 +168,7 @@ def test_add_location():
             "latitude": 40.7128,
             "longitude": -74.0060
         }
-        response = requests.post(f"{BASE_URL}/locations", json=location_data)
+        response = SESSION.post(f"{BASE_URL}/locations", json=location_data)
         if response.status_code == 200:
             data = response.json()
             location_id = data['data']['location_id']
@@ -185,7 +187,7 @@ def test_get_stats():
     """Test getting API statistics"""
     print(f"\n🔍 Testing API statistics...")
     try:
-        response = requests.get(f"{BASE_URL}/stats")
+        response = SESSION.get(f"{BASE_URL}/stats")
         if response.status_code == 200:
             data = response.json()
             stats = data['data']
@@ -202,6 +204,37 @@ def test_get_stats():
         print(f"❌ Get stats error: {e}")
         return None
 
+def test_batch(location_ids):
+    """Test batching mixed GET/POST sub-requests, including an unknown URL"""
+    print(f"\n🔍 Testing batch requests...")
+    try:
+        response = SESSION.post(f"{BASE_URL}/batch", json={
+            "requests": [
+                {"id": "health", "url": "/health"},
+                {"id": "compare", "url": "/compare", "method": "POST", "body": {"location_ids": location_ids}},
+                {"id": "unknown", "url": "/does-not-exist"}
+            ]
+        })
+        if response.status_code == 200:
+            data = response.json()
+            results = {item['id']: item for item in data['data']['responses']}
+            expected = {"health": 200, "compare": 200, "unknown": 404}
+            statuses = {key: results[key]['status'] for key in expected}
+            if statuses == expected:
+                print(f"✅ Batch requests dispatched")
+                print(f"   - Health: {results['health']['body']['message']}")
+                print(f"   - Compare improvement: {results['compare']['body']['data']['improvement_percentage']:.1f}%")
+                print(f"   - Unknown URL: {results['unknown']['status']}")
+            else:
+                print(f"❌ Unexpected batch statuses: {statuses}")
+            return results
+        else:
+            print(f"❌ Batch requests failed: {response.status_code}")
+            return None
+    except Exception as e:
+        print(f"❌ Batch requests error: {e}")
+        return None
+
 def test_places_endpoint():
     """Test the new places endpoint for frontend integration"""
     print("\n" + "="*50)
@@ -236,7 +269,7 @@ def test_places_endpoint():
                 'max_distance_miles': test_case['max_distance_miles']
             }
             
-            response = requests.get(f"{BASE_URL}/places", params=params)
+            response = SESSION.get(f"{BASE_URL}/places", params=params)
             
             if response.status_code == 200:
                 data = response.json()
@@ -287,14 +320,22 @@ def main():
     # Use first 5 locations for testing
     test_location_ids = [loc['id'] for loc in locations[:5]]
     
-    test_optimize_route(test_location_ids)
-    test_compare_routes(test_location_ids)
-    test_visualization(test_location_ids)
-    test_street_routing(test_location_ids)
-    test_quick_optimize(test_location_ids)
-    test_add_location()
-    test_get_stats()
-    test_places_endpoint()
+    # The remaining tests are independent, so run them concurrently over the shared session
+    id_tests = [
+        test_optimize_route,
+        test_compare_routes,
+        test_visualization,
+        test_street_routing,
+        test_quick_optimize,
+        test_batch,
+    ]
+    standalone_tests = [test_add_location, test_get_stats, test_places_endpoint]
+    
+    with ThreadPoolExecutor(max_workers=8) as executor:
+        futures = [executor.submit(test, test_location_ids) for test in id_tests]
+        futures += [executor.submit(test) for test in standalone_tests]
+        for future in futures:
+            future.result()
     
     print("\n🎉 All tests completed!")
     print("\n📖 For more information:")
@@ -1,24 +1,274 @@
 #!/usr/bin/env python3
 
-from fastapi import FastAPI, HTTPException, Query, Body
+from fastapi import FastAPI, HTTPException, Query, Body, Request
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.middleware.gzip import GZipMiddleware
+from fastapi.responses import ORJSONResponse, Response, StreamingResponse
 from pydantic import BaseModel, Field
 from typing import List, Dict, Any, Optional
+from contextlib import asynccontextmanager, suppress
+from collections import OrderedDict
+from functools import lru_cache
+import asyncio
+import hashlib
+import threading
+import msgspec
+import orjson
+from anyio import to_thread
 import uvicorn
 import logging
-import pandas as pd
+import os
+import numpy as np
 
 from api_interface import RouteOptimizationAPI
 
-logging.basicConfig(level=logging.INFO)
+# force=True replaces the handler api_interface configures on import; INFO chatter is dev-only
+logging.basicConfig(
+    level=logging.INFO if os.getenv("DEV") == "1" else logging.WARNING,
+    format="%(asctime)s %(levelname)s %(name)s: %(message)s",
+    force=True
+)
 logger = logging.getLogger(__name__)
 
+THREADPOOL_SIZE = 32
+STREAM_CHUNK_SIZE = 64 * 1024
+BATCH_MAX_REQUESTS = 20
+
+# Created in the lifespan so each uvicorn worker loads its own copy after it starts
+api: Optional[RouteOptimizationAPI] = None
+
+class DynamicBatcher:
+    """Coalesces calls that arrive within `max_delay` seconds and runs each batch's items concurrently on the threadpool."""
+    
+    def __init__(self, process_item, max_batch_size: int = 8, max_delay: float = 0.01):
+        self.process_item = process_item
+        self.max_batch_size = max_batch_size
+        self.max_delay = max_delay
+        self._queue: Optional[asyncio.Queue] = None
+        self._worker: Optional[asyncio.Task] = None
+        self._inflight: set = set()
+    
+    def start(self):
+        # The queue binds to the running loop, so every lifespan gets a fresh one
+        self._queue = asyncio.Queue()
+        self._worker = asyncio.create_task(self._run())
+    
+    async def stop(self):
+        tasks = [task for task in (self._worker, *self._inflight) if task]
+        for task in tasks:
+            task.cancel()
+        for task in tasks:
+            with suppress(asyncio.CancelledError):
+                await task
+        self._worker = None
+        self._inflight.clear()
+        
+        # Nothing will pick up what is still queued, so fail it rather than leave callers waiting
+        while self._queue is not None and not self._queue.empty():
+            _, future = self._queue.get_nowait()
+            self._fail([(None, future)], RuntimeError("Optimizer is shutting down"))
+        self._queue = None
+    
+    async def submit(self, item):
+        if self._queue is None:
+            raise RuntimeError("Optimizer is not running")
+        future = asyncio.get_running_loop().create_future()
+        self._queue.put_nowait((item, future))
+        return await future
+    
+    @staticmethod
+    def _fail(batch, error: BaseException):
+        for _, future in batch:
+            if not future.done():
+                future.set_exception(error)
+    
+    async def _run(self):
+        loop = asyncio.get_running_loop()
+        while True:
+            batch = [await self._queue.get()]
+            try:
+                deadline = loop.time() + self.max_delay
+                while len(batch) < self.max_batch_size:
+                    timeout = deadline - loop.time()
+                    if timeout <= 0:
+                        break
+                    try:
+                        batch.append(await asyncio.wait_for(self._queue.get(), timeout))
+                    except asyncio.TimeoutError:
+                        break
+                
+                # Not awaited here, so a slow batch doesn't hold up the ones queued behind it
+                task = asyncio.create_task(self._dispatch(batch))
+                self._inflight.add(task)
+                task.add_done_callback(self._inflight.discard)
+            except asyncio.CancelledError:
+                self._fail(batch, RuntimeError("Optimizer is shutting down"))
+                raise
+            except Exception as e:
+                logger.error("Error batching optimize calls: %s", e)
+                self._fail(batch, e)
+    
+    async def _dispatch(self, batch):
+        try:
+            results = await asyncio.gather(
+                *[to_thread.run_sync(self.process_item, item) for item, _ in batch],
+                return_exceptions=True
+            )
+        except asyncio.CancelledError:
+            self._fail(batch, RuntimeError("Optimizer is shutting down"))
+            raise
+        
+        for (_, future), result in zip(batch, results):
+            if future.done():
+                continue
+            if isinstance(result, BaseException):
+                future.set_exception(result)
+            else:
+                future.set_result(result)
+
+def _optimize_item(coordinates: np.ndarray) -> Dict[str, Any]:
+    return api.optimize_coordinates(coordinates)
+
+optimize_batcher = DynamicBatcher(_optimize_item)
+
+class ResponseCache:
+    """Thread-safe in-memory LRU for deterministic endpoint results, keyed on a hash of their inputs."""
+    
+    def __init__(self, maxsize: int = 4096):
+        self.maxsize = maxsize
+        self._data: OrderedDict = OrderedDict()
+        self._lock = threading.Lock()
+    
+    @staticmethod
+    def make_key(namespace: str, payload: Any) -> str:
+        digest = hashlib.sha1(orjson.dumps(payload, option=orjson.OPT_SORT_KEYS)).hexdigest()
+        return f"{namespace}:{digest}"
+    
+    def get(self, key: str):
+        with self._lock:
+            if key not in self._data:
+                return None
+            self._data.move_to_end(key)
+            return self._data[key]
+    
+    def set(self, key: str, value: Any):
+        with self._lock:
+            self._data[key] = value
+            self._data.move_to_end(key)
+            if len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+
+response_cache = ResponseCache()
+
+# Serialized /locations and /stats bodies; rebuilt lazily after POST /locations
+_locations_cache: Optional[Dict[str, Any]] = None
+_locations_lock = threading.Lock()
+
+def _get_locations_cached() -> Dict[str, Any]:
+    global _locations_cache
+    with _locations_lock:
+        if _locations_cache is None:
+            locations = api.get_all_locations()
+            stats = {
+                "total_locations": len(locations),
+                "api_version": "1.0.0",
+                "algorithm": "Genetic Algorithm TSP",
+                "distance_formula": "Haversine",
+                "sample_locations": [loc["name"] for loc in locations[:5]]
+            }
+            _locations_cache = {
+                "locations_body": orjson.dumps({
+                    "success": True,
+                    "data": {"locations": locations, "count": len(locations)},
+                    "message": f"Retrieved {len(locations)} locations"
+                }),
+                "stats_body": orjson.dumps({
+                    "success": True,
+                    "data": stats,
+                    "message": "API statistics retrieved"
+                })
+            }
+        return _locations_cache
+
+_HEALTH_BODIES = {
+    ready: orjson.dumps({
+        "success": True,
+        "data": {"status": "healthy", "api_ready": ready},
+        "message": "API is running"
+    })
+    for ready in (True, False)
+}
+
+def _invalidate_locations_cache():
+    global _locations_cache
+    with _locations_lock:
+        _locations_cache = None
+
+def _city_key(city: str) -> str:
+    return city.strip().lower()
+
+# Geocoded endpoints keyed on normalized city names; results are tuples so callers can't mutate the cached copy
+@lru_cache(maxsize=2048)
+def _route_points(from_city: str, to_city: str) -> tuple:
+    points = api.get_route_points_coordinates(from_city=from_city, to_city=to_city)
+    return tuple((name, tuple(point.items())) for name, point in points.items())
+
+@lru_cache(maxsize=2048)
+def _places(from_city: str, to_city: str, max_attractions: int, max_distance_miles: float) -> tuple:
+    attractions = api.get_attractions_along_route(
+        from_city=from_city,
+        to_city=to_city,
+        max_attractions=max_attractions,
+        max_distance_miles=max_distance_miles
+    )
+    # The nested location dict is frozen too, so no level of the cached entry is shared with callers
+    return tuple(
+        tuple({**attraction, "location": tuple(attraction["location"].items())}.items())
+        for attraction in attractions
+    )
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    global api
+    app.state.attraction_coords = {}
+    try:
+        # Data loading and index building run off the event loop, once per worker
+        api = await asyncio.to_thread(RouteOptimizationAPI)
+        # /quick-optimize name lookup; the first attraction with a given name wins
+        for attraction in api.attractions:
+            app.state.attraction_coords.setdefault(attraction["name"], (attraction["latitude"], attraction["longitude"]))
+        logger.info("Route Optimization API initialized successfully")
+    except Exception as e:
+        logger.error("Failed to initialize API: %s", e)
+        api = None
+    app.state.api = api
+    
+    # Compute-bound handlers are plain `def` and run on the anyio worker threadpool
+    to_thread.current_default_thread_limiter().total_tokens = THREADPOOL_SIZE
+    
+    # Pydantic v2 builds model validators at class definition; the OpenAPI schema is the
+    # remaining lazy build, so do it here instead of on the first /docs request
+    app.openapi()
+    
+    if api:
+        _get_locations_cached()
+    
+    optimize_batcher.start()
+    yield
+    await optimize_batcher.stop()
+    _invalidate_locations_cache()
+    _route_points.cache_clear()
+    _places.cache_clear()
+    api = None
+
 app = FastAPI(
     title="Route Optimization API",
     description="API for optimizing travel routes between multiple locations using genetic algorithms",
     version="1.0.0",
     docs_url="/docs",
-    redoc_url="/redoc"
+    redoc_url="/redoc",
+    default_response_class=ORJSONResponse,
+    lifespan=lifespan
 )
 
 app.add_middleware(
@@ -29,12 +279,8 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
-try:
-    api = RouteOptimizationAPI()
-    logger.info("Route Optimization API initialized successfully")
-except Exception as e:
-    logger.error(f"Failed to initialize API: {e}")
-    api = None
+# Coordinate-heavy bodies (/locations, /visualization, /street-routing) compress well
+app.add_middleware(GZipMiddleware, minimum_size=1000, compresslevel=5)
 
 class LocationRequest(BaseModel):
     name: str = Field(..., description="Location name")
@@ -42,46 +288,104 @@ class LocationRequest(BaseModel):
     longitude: float = Field(..., ge=-180, le=180, description="Longitude coordinate")
 
 class RouteOptimizationRequest(BaseModel):
-    location_ids: List[int] = Field(..., min_items=2, description="List of location IDs to optimize")
+    location_ids: List[int] = Field(..., min_length=2, description="List of location IDs to optimize")
 
 class LocationDataRequest(BaseModel):
     key: str = Field(..., description="Location key")
     location: Dict[str, float] = Field(..., description="Location coordinates with lat and lng")
 
+class LocationData(msgspec.Struct):
+    """Fast-path decode target for the /optimize* bodies; LocationDataRequest documents the same shape."""
+    key: str
+    location: Dict[str, float]
+
+_LOCATION_LIST_DECODER = msgspec.json.Decoder(List[LocationData])
+
+LOCATION_LIST_BODY = {
+    "requestBody": {
+        "required": True,
+        "content": {
+            "application/json": {
+                "schema": {"type": "array", "items": LocationDataRequest.model_json_schema()}
+            }
+        }
+    }
+}
+
 class RouteVisualizationRequest(BaseModel):
-    route_ids: List[int] = Field(..., min_items=1, description="List of location IDs for visualization")
+    route_ids: List[int] = Field(..., min_length=1, description="List of location IDs for visualization")
 
 class APIResponse(BaseModel):
     success: bool
     data: Dict[str, Any]
     message: Optional[str] = None
 
-@app.get("/health", response_model=APIResponse)
+class BatchRequestItem(BaseModel):
+    id: str = Field(..., description="Client-chosen identifier echoed back in the response")
+    url: str = Field(..., description="Endpoint path including any query string, e.g. /route-points?fromCity=A&toCity=B")
+    method: str = Field("GET", description="HTTP method")
+    body: Optional[Any] = Field(None, description="JSON body for POST requests")
+
+class BatchRequest(BaseModel):
+    # Capped so a single POST can't fan out into an unbounded number of concurrent sub-requests
+    requests: List[BatchRequestItem] = Field(..., min_length=1, max_length=BATCH_MAX_REQUESTS,
+                                             description="Requests to dispatch in one round trip")
+
+def _stream_json(content: bytes):
+    for start in range(0, len(content), STREAM_CHUNK_SIZE):
+        yield content[start:start + STREAM_CHUNK_SIZE]
+
+def _json_response(payload: Dict[str, Any]) -> Response:
+    content = orjson.dumps(payload, option=orjson.OPT_SERIALIZE_NUMPY)
+    if len(content) <= STREAM_CHUNK_SIZE:
+        return Response(content, media_type="application/json")
+    return StreamingResponse(_stream_json(content), media_type="application/json")
+
+async def _decode_locations(http_request: Request) -> List[LocationData]:
+    try:
+        return _LOCATION_LIST_DECODER.decode(await http_request.body())
+    except (msgspec.ValidationError, msgspec.DecodeError) as e:
+        raise HTTPException(status_code=422, detail=str(e))
+
+def _split_locations(request: List[LocationData]):
+    keys = [location_data.key for location_data in request]
+    locations = [location_data.location for location_data in request]
+    coordinates = np.fromiter(
+        (
+            value
+            for location in locations
+            for value in (location.get('lat', np.nan), location.get('lng', np.nan))
+        ),
+        dtype=np.float64,
+        count=2 * len(request)
+    ).reshape(-1, 2)
+    
+    invalid = np.isnan(coordinates).any(axis=1)
+    if invalid.any():
+        bad_key = keys[int(np.argmax(invalid))]
+        raise HTTPException(status_code=400, detail=f"Invalid coordinates for location {bad_key}")
+    
+    return coordinates, keys, locations
+
+@app.get("/health", responses={200: {"model": APIResponse}})
 async def health_check():
-    return APIResponse(
-        success=True,
-        data={"status": "healthy", "api_ready": api is not None},
-        message="API is running"
-    )
+    return Response(_HEALTH_BODIES[api is not None], media_type="application/json")
 
-@app.get("/locations", response_model=APIResponse)
+@app.get("/locations", responses={200: {"model": APIResponse}})
 async def get_locations():
     try:
         if not api:
             raise HTTPException(status_code=503, detail="API not initialized")
         
-        locations = api.get_all_locations()
-        return APIResponse(
-            success=True,
-            data={"locations": locations, "count": len(locations)},
-            message=f"Retrieved {len(locations)} locations"
-        )
+        return Response(_get_locations_cached()["locations_body"], media_type="application/json")
+    except HTTPException:
+        raise
     except Exception as e:
-        logger.error(f"Error getting locations: {e}")
+        logger.error("Error getting locations: %s", e)
         raise HTTPException(status_code=500, detail=str(e))
 
-@app.post("/locations", response_model=APIResponse)
-async def add_location(location: LocationRequest):
+@app.post("/locations", responses={200: {"model": APIResponse}})
+def add_location(location: LocationRequest):
     try:
         if not api:
             raise HTTPException(status_code=503, detail="API not initialized")
@@ -91,18 +395,22 @@ async def add_location(location: LocationRequest):
             latitude=location.latitude,
             longitude=location.longitude
         )
-        
-        return APIResponse(
-            success=True,
-            data={"location_id": location_id, "location": location.dict()},
-            message=f"Location '{location.name}' added successfully"
-        )
+        _invalidate_locations_cache()
+        # The new attraction can fall along any cached city pair
+        _places.cache_clear()
+        app.state.attraction_coords.setdefault(location.name, (location.latitude, location.longitude))
+        
+        return {
+            "success": True,
+            "data": {"location_id": location_id, "location": location.model_dump()},
+            "message": f"Location '{location.name}' added successfully"
+        }
     except Exception as e:
-        logger.error(f"Error adding location: {e}")
+        logger.error("Error adding location: %s", e)
         raise HTTPException(status_code=500, detail=str(e))
 
-@app.post("/optimize", response_model=APIResponse)
-async def optimize_route(request: List[LocationDataRequest]):
+async def _optimize_core(request: List[LocationData], include_directions: bool = False,
+                         include_routing: bool = False) -> Dict[str, Any]:
     try:
         if not api:
             raise HTTPException(status_code=503, detail="API not initialized")
@@ -110,143 +418,155 @@ async def optimize_route(request: List[LocationDataRequest]):
         if len(request) < 2:
             raise HTTPException(status_code=400, detail="Need at least 2 locations to optimize")
         
-        coordinates = []
-        location_data_for_frontend = []
-        
-        for location_data in request:
-            lat = location_data.location.get('lat')
-            lng = location_data.location.get('lng')
-            if lat is None or lng is None:
-                raise HTTPException(status_code=400, detail=f"Invalid coordinates for location {location_data.key}")
-            
-            coordinates.append([lat, lng])
-            location_data_for_frontend.append({
-                "key": location_data.key,
-                "location": location_data.location
-            })
-        
-        temp_location_ids = list(range(len(coordinates)))
-        optimized_result = api.optimize_route(temp_location_ids)
-        
-        optimized_route = []
-        for optimized_id in optimized_result['optimized_route']['location_ids']:
-            if optimized_id < len(location_data_for_frontend):
-                optimized_route.append(location_data_for_frontend[optimized_id])
-        
-        return APIResponse(
-            success=True,
-            data={"optimized_route": optimized_route},
-            message="Route optimized successfully"
-        )
+        coordinates, keys, locations = _split_locations(request)
+        
+        cache_key = response_cache.make_key("optimize", coordinates.tolist())
+        optimized_result = response_cache.get(cache_key)
+        if optimized_result is None:
+            optimized_result = await optimize_batcher.submit(coordinates)
+            response_cache.set(cache_key, optimized_result)
+        
+        # The optimizer returns a permutation of the submitted indices
+        permutation = optimized_result['optimized_route']['location_ids']
+        if permutation and max(permutation) >= len(keys):
+            raise ValueError("Optimizer returned an out-of-range location index")
+        optimized_route = [{"key": keys[i], "location": locations[i]} for i in permutation]
+        
+        data = {"optimized_route": optimized_route}
+        message = "Route optimized successfully"
+        
+        if include_directions:
+            data["directions"] = await to_thread.run_sync(api.get_street_directions, optimized_route)
+            message = "Route optimized with street directions"
+        
+        if include_routing:
+            # The permutation indexes the submitted stops, not catalog attractions
+            data["routing_data"] = await to_thread.run_sync(
+                api.get_coordinate_routing_data,
+                coordinates[permutation],
+                [keys[i] for i in permutation]
+            )
+            data["total_distance"] = optimized_result['optimized_route']['total_distance']
+            message = "Route optimized with street routing data"
+        
+        return {
+            "success": True,
+            "data": data,
+            "message": message
+        }
+    except HTTPException:
+        raise
     except Exception as e:
-        logger.error(f"Error optimizing route: {e}")
+        logger.error("Error optimizing route: %s", e)
         raise HTTPException(status_code=500, detail=str(e))
 
-@app.post("/compare", response_model=APIResponse)
-async def compare_routes(request: RouteOptimizationRequest):
+@app.post("/optimize", responses={200: {"model": APIResponse}}, openapi_extra=LOCATION_LIST_BODY)
+async def optimize_route(request: Request):
+    return await _optimize_core(await _decode_locations(request))
+
+@app.post("/compare", responses={200: {"model": APIResponse}})
+def compare_routes(request: RouteOptimizationRequest):
     try:
         if not api:
             raise HTTPException(status_code=503, detail="API not initialized")
         
         comparison = api.compare_with_random(request.location_ids)
         
-        return APIResponse(
-            success=True,
-            data=comparison,
-            message="Route comparison completed"
-        )
+        return {
+            "success": True,
+            "data": comparison,
+            "message": "Route comparison completed"
+        }
     except Exception as e:
-        logger.error(f"Error comparing routes: {e}")
+        logger.error("Error comparing routes: %s", e)
         raise HTTPException(status_code=500, detail=str(e))
 
-@app.post("/visualization", response_model=APIResponse)
-async def get_visualization_data(request: RouteVisualizationRequest):
+@app.post("/visualization", responses={200: {"model": APIResponse}})
+def get_visualization_data(request: RouteVisualizationRequest):
     try:
         if not api:
             raise HTTPException(status_code=503, detail="API not initialized")
         
-        visualization_data = api.get_route_visualization_data(request.route_ids)
-        
-        return APIResponse(
-            success=True,
-            data=visualization_data,
-            message="Visualization data retrieved"
-        )
+        cache_key = response_cache.make_key("visualization", request.route_ids)
+        visualization_data = response_cache.get(cache_key)
+        if visualization_data is None:
+            visualization_data = api.get_route_visualization_data(request.route_ids)
+            response_cache.set(cache_key, visualization_data)
+        
+        return _json_response({
+            "success": True,
+            "data": visualization_data,
+            "message": "Visualization data retrieved"
+        })
     except Exception as e:
-        logger.error(f"Error getting visualization data: {e}")
+        logger.error("Error getting visualization data: %s", e)
         raise HTTPException(status_code=500, detail=str(e))
 
-@app.post("/street-routing", response_model=APIResponse)
-async def get_street_routing_data(request: RouteVisualizationRequest):
+@app.post("/street-routing", responses={200: {"model": APIResponse}})
+def get_street_routing_data(request: RouteVisualizationRequest):
     try:
         if not api:
             raise HTTPException(status_code=503, detail="API not initialized")
         
-        routing_data = api.get_street_routing_data(request.route_ids)
-        
-        return APIResponse(
-            success=True,
-            data=routing_data,
-            message="Street routing data retrieved"
-        )
+        cache_key = response_cache.make_key("street-routing", request.route_ids)
+        routing_data = response_cache.get(cache_key)
+        if routing_data is None:
+            routing_data = api.get_street_routing_data(request.route_ids)
+            response_cache.set(cache_key, routing_data)
+        
+        return _json_response({
+            "success": True,
+            "data": routing_data,
+            "message": "Street routing data retrieved"
+        })
     except Exception as e:
-        logger.error(f"Error getting street routing data: {e}")
+        logger.error("Error getting street routing data: %s", e)
         raise HTTPException(status_code=500, detail=str(e))
 
 @app.post("/quick-optimize")
 async def quick_optimize(
     location_ids: List[str] = Body(..., embed=True, description="List of location IDs to optimize")
 ):
-    print("location_ids:", location_ids)
+    logger.debug("quick_optimize location_ids=%s", location_ids)
     try:
         if not api:
             raise HTTPException(status_code=503, detail="API not initialized")
         
-        try:
-            result = []
-            df = pd.read_csv("analysis/california_attractions_data.csv")
-            for location in location_ids:
-                record = df[df["name"] == location]
-                if record.empty:
-                    pass
-                loc = {"key": record["name"].values[0]
-                        , "location": {"lat": record["latitude"].values[0], "lng": record["longitude"].values[0]}}
-                result.append(loc)
-        except ValueError:
-            raise HTTPException(status_code=400, detail="Invalid location IDs format")
+        attraction_coords = app.state.attraction_coords
+        result = []
+        missing = []
+        for location in location_ids:
+            coords = attraction_coords.get(location)
+            if coords is None:
+                missing.append(location)
+            else:
+                result.append({"key": location, "location": {"lat": coords[0], "lng": coords[1]}})
+        
+        if missing:
+            raise HTTPException(status_code=404, detail=f"Unknown locations: {missing}")
         
         return result
+    except HTTPException:
+        raise
     except Exception as e:
-        logger.error(f"Error in quick optimize: {e}")
+        logger.error("Error in quick optimize: %s", e)
         raise HTTPException(status_code=500, detail=str(e))
 
-@app.get("/stats", response_model=APIResponse)
+@app.get("/stats", responses={200: {"model": APIResponse}})
 async def get_api_stats():
     try:
         if not api:
             raise HTTPException(status_code=503, detail="API not initialized")
         
-        locations = api.get_all_locations()
-        
-        stats = {
-            "total_locations": len(locations),
-            "api_version": "1.0.0",
-            "algorithm": "Genetic Algorithm TSP",
-            "distance_formula": "Haversine",
-            "sample_locations": [loc["name"] for loc in locations[:5]]
-        }
-        
-        return APIResponse(
-            success=True,
-            data=stats,
-            message="API statistics retrieved"
-        )
+        return Response(_get_locations_cached()["stats_body"], media_type="application/json")
+    except HTTPException:
+        raise
     except Exception as e:
-        logger.error(f"Error getting stats: {e}")
+        logger.error("Error getting stats: %s", e)
         raise HTTPException(status_code=500, detail=str(e))
 
-@app.get("/places", response_model=APIResponse)
-async def get_places_along_route(
+@app.get("/places", responses={200: {"model": APIResponse}})
+def get_places_along_route(
     fromCity: str = Query(..., description="Starting city"),
     toCity: str = Query(..., description="Destination city"),
     max_attractions: int = Query(9, ge=1, le=9, description="Maximum number of attractions to suggest"),
@@ -256,24 +576,24 @@ async def get_places_along_route(
         if not api:
             raise HTTPException(status_code=503, detail="API not initialized")
         
-        attractions = api.get_attractions_along_route(
-            from_city=fromCity,
-            to_city=toCity,
-            max_attractions=max_attractions,
-            max_distance_miles=max_distance_miles
-        )
-        
-        return APIResponse(
-            success=True,
-            data={"attractions": attractions},
-            message=f"Found {len(attractions)} attractions along route"
-        )
+        cached = _places(_city_key(fromCity), _city_key(toCity), max_attractions, max_distance_miles)
+        attractions = []
+        for cached_attraction in cached:
+            attraction = dict(cached_attraction)
+            attraction["location"] = dict(attraction["location"])
+            attractions.append(attraction)
+        
+        return {
+            "success": True,
+            "data": {"attractions": attractions},
+            "message": f"Found {len(attractions)} attractions along route"
+        }
     except Exception as e:
-        logger.error(f"Error getting attractions along route: {e}")
+        logger.error("Error getting attractions along route: %s", e)
         raise HTTPException(status_code=500, detail=str(e))
 
-@app.get("/route-points", response_model=APIResponse)
-async def get_route_points(
+@app.get("/route-points", responses={200: {"model": APIResponse}})
+def get_route_points(
     fromCity: str = Query(..., description="Starting city name"),
     toCity: str = Query(..., description="Destination city name")
 ):
@@ -281,118 +601,110 @@ async def get_route_points(
         if not api:
             raise HTTPException(status_code=503, detail="API not initialized")
         
-        route_points = api.get_route_points_coordinates(from_city=fromCity, to_city=toCity)
+        cached = _route_points(_city_key(fromCity), _city_key(toCity))
+        route_points = {name: dict(point) for name, point in cached}
+        route_points["start"]["city"] = fromCity
+        route_points["end"]["city"] = toCity
         
-        return APIResponse(
-            success=True,
-            data=route_points,
-            message=f"Found coordinates for route from {fromCity} to {toCity}"
-        )
+        return Response(orjson.dumps({
+            "success": True,
+            "data": route_points,
+            "message": f"Found coordinates for route from {fromCity} to {toCity}"
+        }), media_type="application/json")
     except Exception as e:
-        logger.error(f"Error getting route points: {e}")
+        logger.error("Error getting route points: %s", e)
         raise HTTPException(status_code=500, detail=str(e))
 
-@app.post("/optimize-with-directions", response_model=APIResponse)
-async def optimize_with_directions(request: List[LocationDataRequest]):
-    try:
-        if not api:
-            raise HTTPException(status_code=503, detail="API not initialized")
-        
-        if len(request) < 2:
-            raise HTTPException(status_code=400, detail="Need at least 2 locations to optimize")
-        
-        coordinates = []
-        location_data_for_frontend = []
-        
-        for location_data in request:
-            lat = location_data.location.get('lat')
-            lng = location_data.location.get('lng')
-            if lat is None or lng is None:
-                raise HTTPException(status_code=400, detail=f"Invalid coordinates for location {location_data.key}")
-            
-            coordinates.append([lat, lng])
-            location_data_for_frontend.append({
-                "key": location_data.key,
-                "location": location_data.location
-            })
-        
-        temp_location_ids = list(range(len(coordinates)))
-        optimized_result = api.optimize_route(temp_location_ids)
-        
-        optimized_route = []
-        for optimized_id in optimized_result['optimized_route']['location_ids']:
-            if optimized_id < len(location_data_for_frontend):
-                optimized_route.append(location_data_for_frontend[optimized_id])
-        
-        directions_data = api.get_street_directions(optimized_route)
-        
-        return APIResponse(
-            success=True,
-            data={
-                "optimized_route": optimized_route,
-                "directions": directions_data
-            },
-            message="Route optimized with street directions"
-        )
-    except Exception as e:
-        logger.error(f"Error optimizing route with directions: {e}")
-        raise HTTPException(status_code=500, detail=str(e))
+@app.post("/optimize-with-directions", responses={200: {"model": APIResponse}}, openapi_extra=LOCATION_LIST_BODY)
+async def optimize_with_directions(request: Request):
+    return await _optimize_core(await _decode_locations(request), include_directions=True)
 
-@app.post("/optimize-with-routing", response_model=APIResponse)
-async def optimize_route_with_routing(request: List[LocationDataRequest]):
+@app.post("/optimize-with-routing", responses={200: {"model": APIResponse}}, openapi_extra=LOCATION_LIST_BODY)
+async def optimize_route_with_routing(request: Request):
+    return await _optimize_core(await _decode_locations(request), include_routing=True)
+
+async def _dispatch_subrequest(item: BatchRequestItem) -> Dict[str, Any]:
+    path, _, query = item.url.partition("?")
+    if path == "/batch":
+        return {"id": item.id, "status": 400, "body": {"detail": "Nested batch requests are not supported"}}
+    
+    body = orjson.dumps(item.body) if item.body is not None else b""
+    headers = [(b"content-type", b"application/json")] if body else []
+    scope = {
+        "type": "http",
+        "asgi": {"version": "3.0"},
+        "http_version": "1.1",
+        "method": item.method.upper(),
+        "scheme": "http",
+        "path": path,
+        "raw_path": path.encode(),
+        "root_path": "",
+        "query_string": query.encode(),
+        "headers": headers,
+        "client": None,
+        "server": None,
+    }
+    
+    request_sent = False
+    
+    async def receive():
+        nonlocal request_sent
+        if not request_sent:
+            request_sent = True
+            return {"type": "http.request", "body": body, "more_body": False}
+        # Block like an idle client until the response is finished
+        await asyncio.Event().wait()
+    
+    status = 500
+    content_type = b""
+    chunks = []
+    
+    async def send(message):
+        nonlocal status, content_type
+        if message["type"] == "http.response.start":
+            status = message["status"]
+            content_type = dict(message.get("headers", [])).get(b"content-type", b"")
+        elif message["type"] == "http.response.body":
+            chunks.append(message.get("body", b""))
+    
     try:
-        if not api:
-            raise HTTPException(status_code=503, detail="API not initialized")
-        
-        if len(request) < 2:
-            raise HTTPException(status_code=400, detail="Need at least 2 locations to optimize")
-        
-        coordinates = []
-        location_data_for_frontend = []
-        
-        for location_data in request:
-            lat = location_data.location.get('lat')
-            lng = location_data.location.get('lng')
-            if lat is None or lng is None:
-                raise HTTPException(status_code=400, detail=f"Invalid coordinates for location {location_data.key}")
-            
-            coordinates.append([lat, lng])
-            location_data_for_frontend.append({
-                "key": location_data.key,
-                "location": location_data.location
-            })
-        
-        temp_location_ids = list(range(len(coordinates)))
-        optimized_result = api.optimize_route(temp_location_ids)
-        
-        optimized_route = []
-        for optimized_id in optimized_result['optimized_route']['location_ids']:
-            if optimized_id < len(location_data_for_frontend):
-                optimized_route.append(location_data_for_frontend[optimized_id])
-        
-        optimized_ids = optimized_result['optimized_route']['location_ids']
-        routing_data = api.get_street_routing_data(optimized_ids)
-        
-        result = {
-            "optimized_route": optimized_route,
-            "routing_data": routing_data,
-            "total_distance": optimized_result['optimized_route']['total_distance']
-        }
-        
-        return APIResponse(
-            success=True,
-            data=result,
-            message="Route optimized with street routing data"
-        )
+        # Go through the full middleware stack so exception handlers produce the usual error responses
+        await app(scope, receive, send)
     except Exception as e:
-        logger.error(f"Error optimizing route with routing: {e}")
-        raise HTTPException(status_code=500, detail=str(e))
+        logger.error("Error in batch sub-request %s: %s", item.id, e)
+        if not chunks:
+            return {"id": item.id, "status": 500, "body": {"detail": str(e)}}
+    
+    content = b"".join(chunks)
+    if not content:
+        return {"id": item.id, "status": status, "body": None}
+    # Non-JSON routes such as /docs come back as text rather than failing the whole batch
+    if content_type.split(b";")[0].strip() == b"application/json":
+        try:
+            return {"id": item.id, "status": status, "body": orjson.loads(content)}
+        except orjson.JSONDecodeError as e:
+            logger.error("Invalid JSON in batch sub-response %s: %s", item.id, e)
+    return {"id": item.id, "status": status, "body": content.decode("utf-8", errors="replace")}
+
+@app.post("/batch", responses={200: {"model": APIResponse}})
+async def batch(payload: BatchRequest):
+    responses = await asyncio.gather(*[_dispatch_subrequest(item) for item in payload.requests])
+    return {
+        "success": True,
+        "data": {"responses": responses},
+        "message": f"Processed {len(responses)} requests"
+    }
 
 if __name__ == "__main__":
+    dev_mode = os.getenv("DEV") == "1"
     uvicorn.run(
         "web_api:app",
         host="0.0.0.0",
         port=8000,
-        reload=True,
-        log_level="info"
+        reload=dev_mode,
+        # Locations added through POST /locations and the in-process caches live in one worker's
+        # memory, so extra workers are opt-in for read-only deployments
+        workers=1 if dev_mode else int(os.getenv("WEB_WORKERS", "1")),
+        log_level="info",
+        access_log=dev_mode
     ) 
\ No newline at end of file
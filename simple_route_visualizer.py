@@ -6,15 +6,84 @@ A quick Python app with search bars and interactive map visualization
 
 import tkinter as tk
 from tkinter import ttk, messagebox
-import folium
 import webbrowser
-import tempfile
 import os
-from geopy.geocoders import Nominatim
-from geopy.distance import geodesic
+import shelve
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
 import requests
+from requests.adapters import HTTPAdapter
 import json
 
+# Map page served once by the in-process server; it polls /route.json and redraws
+# whenever a new search bumps the version
+MAP_PAGE = """<!DOCTYPE html>
+<html>
+<head>
+    <meta charset="utf-8" />
+    <title>Route Map</title>
+    <link rel="stylesheet" href="https://unpkg.com/leaflet@1.7.1/dist/leaflet.css" />
+    <script src="https://unpkg.com/leaflet@1.7.1/dist/leaflet.js"></script>
+    <style>
+        body { margin: 0; padding: 0; }
+        #map { width: 100%; height: 100vh; }
+    </style>
+</head>
+<body>
+    <div id="map"></div>
+    <script>
+        const map = L.map('map').setView([37.5, -119.5], 6);
+        const routeLayer = L.layerGroup().addTo(map);
+        let version = 0;
+        
+        L.tileLayer('https://{s}.tile.openstreetmap.org/{z}/{x}/{y}.png', {
+            attribution: '&copy; OpenStreetMap contributors'
+        }).addTo(map);
+        
+        function addMarker(point, color, popup) {
+            L.circleMarker(point, {radius: 8, color: color, fillColor: color, fillOpacity: 0.8})
+                .addTo(routeLayer)
+                .bindPopup(popup);
+        }
+        
+        function render(data) {
+            routeLayer.clearLayers();
+            map.setView(data.center, 8);
+            
+            addMarker(data.start.point, 'blue', `<b>Start: ${data.start.city}</b>`);
+            addMarker(data.end.point, 'red', `<b>End: ${data.end.city}</b>`);
+            
+            L.polyline([data.start.point, data.end.point], {color: 'blue', weight: 3, opacity: 0.8})
+                .addTo(routeLayer)
+                .bindPopup(`Route: ${data.start.city} → ${data.end.city}`);
+            
+            data.attractions.forEach(attraction => {
+                addMarker(attraction.point, 'green',
+                    `<b>${attraction.name}</b><br>Category: ${attraction.category}<br>Distance: ${attraction.distance.toFixed(2)} miles`);
+            });
+        }
+        
+        async function poll() {
+            try {
+                const response = await fetch('/route.json', {cache: 'no-store'});
+                const data = await response.json();
+                if (data.version !== version) {
+                    version = data.version;
+                    render(data);
+                }
+            } catch (e) {
+                // The GUI may have closed; keep the last map on screen
+            }
+        }
+        
+        poll();
+        setInterval(poll, 500);
+    </script>
+</body>
+</html>
+""".encode('utf-8')
+
 class RouteVisualizer:
     def __init__(self):
         self.root = tk.Tk()
@@ -25,6 +94,22 @@ class RouteVisualizer:
         # API URL
         self.api_url = "http://localhost:8000"
         
+        # Keep-alive connections to the API, reused across searches
+        self.session = requests.Session()
+        self.session.mount("http://", HTTPAdapter(pool_connections=4, pool_maxsize=8))
+        self.pool = ThreadPoolExecutor(max_workers=2)
+        
+        # Map server on an ephemeral port; the browser tab is opened on the first search
+        self.latest_route = {'version': 0}
+        self.map_server = ThreadingHTTPServer(('127.0.0.1', 0), self._make_map_handler())
+        self.map_url = f"http://127.0.0.1:{self.map_server.server_address[1]}/"
+        self.map_opened = False
+        threading.Thread(target=self.map_server.serve_forever, daemon=True).start()
+        
+        # Persistent lookup cache keyed by city pair; the lock guards it across pool threads
+        self.cache = shelve.open("route_cache.db")
+        self.cache_lock = threading.Lock()
+        
         # Create GUI
         self.create_widgets()
         
@@ -138,11 +223,12 @@ class RouteVisualizer:
         self.root.update()
         
         try:
-            # Get route points from API
-            route_data = self.get_route_points(start_city, end_city)
+            # Route points and attractions are independent lookups, so fetch them together
+            route_future = self.pool.submit(self.get_route_points, start_city, end_city)
+            attractions_future = self.pool.submit(self.get_attractions, start_city, end_city)
+            route_data = route_future.result(timeout=12)
             if route_data:
-                # Get attractions along route
-                attractions = self.get_attractions(start_city, end_city)
+                attractions = attractions_future.result(timeout=12)
                 
                 # Create map
                 self.create_map(route_data, attractions)
@@ -155,8 +241,47 @@ class RouteVisualizer:
             self.status_label.config(text=f"❌ Error: {str(e)}")
             messagebox.showerror("Error", f"Could not find route: {str(e)}")
     
+    def _make_map_handler(self):
+        visualizer = self
+        
+        class MapHandler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                if self.path == '/':
+                    body, content_type = MAP_PAGE, 'text/html; charset=utf-8'
+                elif self.path == '/route.json':
+                    body, content_type = json.dumps(visualizer.latest_route).encode('utf-8'), 'application/json'
+                else:
+                    self.send_error(404)
+                    return
+                
+                self.send_response(200)
+                self.send_header('Content-Type', content_type)
+                self.send_header('Content-Length', str(len(body)))
+                self.send_header('Cache-Control', 'no-store')
+                self.end_headers()
+                self.wfile.write(body)
+            
+            def log_message(self, format, *args):
+                pass
+        
+        return MapHandler
+    
+    def _cache_get(self, key):
+        with self.cache_lock:
+            return self.cache.get(key)
+    
+    def _cache_set(self, key, value):
+        with self.cache_lock:
+            self.cache[key] = value
+            self.cache.sync()
+    
     def get_route_points(self, start_city, end_city):
         """Get route points from API"""
+        cache_key = f"route:{start_city}|{end_city}".lower()
+        cached = self._cache_get(cache_key)
+        if cached is not None:
+            return cached
+        
         try:
             url = f"{self.api_url}/route-points"
             params = {
@@ -164,11 +289,12 @@ class RouteVisualizer:
                 'toCity': end_city
             }
             
-            response = requests.get(url, params=params, timeout=10)
+            response = self.session.get(url, params=params, timeout=10)
             response.raise_for_status()
             
             data = response.json()
             if data.get('success'):
+                self._cache_set(cache_key, data['data'])
                 return data['data']
             else:
                 raise Exception(data.get('message', 'Unknown error'))
@@ -178,6 +304,11 @@ class RouteVisualizer:
     
     def get_attractions(self, start_city, end_city):
         """Get attractions along route"""
+        cache_key = f"places:{start_city}|{end_city}".lower()
+        cached = self._cache_get(cache_key)
+        if cached is not None:
+            return cached
+        
         try:
             url = f"{self.api_url}/places"
             params = {
@@ -186,11 +317,12 @@ class RouteVisualizer:
                 'max_attractions': 5
             }
             
-            response = requests.get(url, params=params, timeout=10)
+            response = self.session.get(url, params=params, timeout=10)
             response.raise_for_status()
             
             data = response.json()
             if data.get('success'):
+                self._cache_set(cache_key, data['data']['attractions'])
                 return data['data']['attractions']
             else:
                 return []
@@ -207,74 +339,38 @@ class RouteVisualizer:
             end_lat = route_data['end']['lat']
             end_lng = route_data['end']['lng']
             
-            # Calculate center
-            center_lat = (start_lat + end_lat) / 2
-            center_lng = (start_lng + end_lng) / 2
-            
-            # Create map
-            m = folium.Map(
-                location=[center_lat, center_lng],
-                zoom_start=8,
-                tiles='OpenStreetMap'
-            )
-            
-            # Add start marker
-            folium.Marker(
-                [start_lat, start_lng],
-                popup=f"<b>Start: {route_data['start']['city']}</b>",
-                icon=folium.Icon(color='blue', icon='info-sign')
-            ).add_to(m)
-            
-            # Add end marker
-            folium.Marker(
-                [end_lat, end_lng],
-                popup=f"<b>End: {route_data['end']['city']}</b>",
-                icon=folium.Icon(color='red', icon='info-sign')
-            ).add_to(m)
-            
-            # Add route line
-            folium.PolyLine(
-                locations=[[start_lat, start_lng], [end_lat, end_lng]],
-                color='blue',
-                weight=3,
-                opacity=0.8,
-                popup=f"Route: {route_data['start']['city']} → {route_data['end']['city']}"
-            ).add_to(m)
-            
-            # Add attractions
-            for i, attraction in enumerate(attractions[:5]):  # Show first 5 attractions
-                lat = attraction['location']['lat']
-                lng = attraction['location']['lng']
-                name = attraction['name']
-                category = attraction.get('category', 'Unknown')
-                distance = attraction.get('distance_from_route', 0)
-                
-                popup_html = f"""
-                <b>{name}</b><br>
-                Category: {category}<br>
-                Distance: {distance:.2f} miles
-                """
-                
-                folium.Marker(
-                    [lat, lng],
-                    popup=popup_html,
-                    icon=folium.Icon(color='green', icon='star')
-                ).add_to(m)
-            
-            # Save map to temporary file
-            with tempfile.NamedTemporaryFile(delete=False, suffix='.html', mode='w') as f:
-                m.save(f.name)
-                temp_file = f.name
+            # Swap in the new route; the open map tab picks it up on its next poll
+            self.latest_route = {
+                'version': self.latest_route['version'] + 1,
+                'center': [(start_lat + end_lat) / 2, (start_lng + end_lng) / 2],
+                'start': {'point': [start_lat, start_lng], 'city': route_data['start']['city']},
+                'end': {'point': [end_lat, end_lng], 'city': route_data['end']['city']},
+                'attractions': [
+                    {
+                        'point': [attraction['location']['lat'], attraction['location']['lng']],
+                        'name': attraction['name'],
+                        'category': attraction.get('category', 'Unknown'),
+                        'distance': attraction.get('distance_from_route', 0)
+                    }
+                    for attraction in attractions[:5]  # Show first 5 attractions
+                ]
+            }
             
-            # Open in browser
-            webbrowser.open(f'file://{temp_file}')
+            if not self.map_opened:
+                webbrowser.open(self.map_url)
+                self.map_opened = True
             
         except Exception as e:
             raise Exception(f"Map creation failed: {str(e)}")
     
     def run(self):
         """Start the application"""
-        self.root.mainloop()
+        try:
+            self.root.mainloop()
+        finally:
+            self.pool.shutdown(wait=False)
+            self.map_server.shutdown()
+            self.cache.close()
 
 def main():
     """Main function"""